@@ -3,6 +3,7 @@
 
 import logging
 import requests
+from requests.adapters import HTTPAdapter
 from guardrails import (
     fetch_goplus_risk,
     calculate_risk_score,
@@ -15,10 +16,12 @@ logger = logging.getLogger(__name__)
 
 
 class DataFetcher:
-    def __init__(self):
-        # Keeping this lightweight on purpose.
-        # If we need config/state later, this is where it’ll live.
-        pass
+    def __init__(self, pool_maxsize: int = 16):
+        # One keep-alive session for every Dexscreener call, so repeat lookups
+        # reuse the TLS connection instead of handshaking each time.
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize))
+        self.session.headers.update({"Accept": "application/json", "Accept-Encoding": "gzip, deflate"})
 
     def guess_chain(self, address: str) -> str | None:
         """
@@ -54,7 +57,7 @@ class DataFetcher:
         try:
             # First try the direct pair endpoint.
             url = f"https://api.dexscreener.com/latest/dex/pairs/{chain}/{address}"
-            res = requests.get(url, timeout=10)
+            res = self.session.get(url, timeout=10)
             data = res.json()
             pair = data.get("pair")
 
@@ -64,7 +67,7 @@ class DataFetcher:
                 logger.info(f"📦 Dexscreener raw response for {chain} / {address}: {data}")
 
                 search_url = f"https://api.dexscreener.com/latest/dex/search/?q={address}"
-                search_res = requests.get(search_url, timeout=10)
+                search_res = self.session.get(search_url, timeout=10)
                 data = search_res.json()
 
                 logger.info(f"🔍 Dexscreener fallback search for {address}: {data}")
@@ -1,11 +1,12 @@
 # x_poster.py
+import startup_profile
+startup_profile.enable()  # --profile-startup / WHIZPER_PROFILE_STARTUP=1: time every import below
+
 import os
-import sys
 import re
 import tweepy
 from dotenv import load_dotenv
-from price_fetcher import build_x_daily_summary_text
-from news_monitor import summarize_market_news  # pulls curated headlines & tilt
+from news_monitor import refresh_news_if_stale, summarize_market_news  # pulls curated headlines & tilt
 
 load_dotenv()
 
@@ -92,17 +93,21 @@ def post(text: str):
     print("Tweeted:", text)
 
 def do_daily():
+    from price_fetcher import build_x_daily_summary_text
     post(build_x_daily_summary_text())
 
 def do_news():
+    refresh_news_if_stale()
     post(_build_news_tweet())
 
 # CLI:
 #   python x_poster.py daily
 #   python x_poster.py news
-if __name__ == "__main__":
-    if len(sys.argv) > 1:
-        cmd = sys.argv[1].lower()
+def main():
+    startup_profile.report("x_poster")
+    args = startup_profile.args()
+    if args:
+        cmd = args[0].lower()
         if cmd == "daily":
             do_daily()
         elif cmd == "news":
@@ -110,4 +115,7 @@ if __name__ == "__main__":
         else:
             print("usage: python x_poster.py [daily|news]")
     else:
-        print("usage: python x_poster.py [daily|news]")
\ No newline at end of file
+        print("usage: python x_poster.py [daily|news]")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
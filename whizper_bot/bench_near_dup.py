@@ -0,0 +1,79 @@
+# bench_near_dup.py
+"""
+Times near-duplicate clustering as the headline count grows.
+
+    python bench_near_dup.py [N ...]
+
+Each synthetic story is syndicated 1-4 times with light edits (a dropped or
+swapped word, different casing/punctuation, an outlet suffix). The LSH pass
+should scale about linearly; a naive all-pairs Jaccard pass is timed
+alongside on the smaller sizes for contrast.
+"""
+import random
+import sys
+import time
+
+from near_dup import cluster, jaccard, shingles
+
+_WORDS = (
+    "bitcoin ether solana fed sec etf rally slump record inflows outflows rate cut hike "
+    "traders miners exchange lawsuit approval delay court ruling stablecoin treasury "
+    "market crypto stocks bonds yields dollar gold oil china europe japan whales "
+    "liquidations funding options expiry halving upgrade hack exploit bridge token"
+).split()
+
+def _vocab(size: int = 4000, seed: int = 3) -> list[str]:
+    # real headline vocabulary is large; a tiny one would make unrelated stories collide
+    rng = random.Random(seed)
+    syllables = ["ba", "ko", "ri", "tem", "lu", "sa", "vor", "ne", "qui", "dra", "pe", "zo", "mi", "gal"]
+    extra = {"".join(rng.choices(syllables, k=rng.randint(2, 4))) for _ in range(size)}
+    return _WORDS + sorted(extra)
+
+def _headlines(n_stories: int, seed: int = 11) -> tuple[list[dict], int]:
+    rng = random.Random(seed)
+    vocab = _vocab()
+    items = []
+    for s in range(n_stories):
+        base = rng.sample(_WORDS, 3) + rng.sample(vocab, 6)
+        for copy in range(rng.randint(1, 4)):
+            words = list(base)
+            if copy:
+                if rng.random() < 0.5:
+                    words.pop(rng.randrange(len(words)))
+                else:
+                    i = rng.randrange(len(words) - 1)
+                    words[i], words[i + 1] = words[i + 1], words[i]
+            title = " ".join(words).title() + rng.choice(["", ":", " - Reuters", " | CoinDesk"])
+            items.append({"title": title, "source": f"outlet{copy}", "story": s})
+    rng.shuffle(items)
+    return items, n_stories
+
+def _all_pairs(items, threshold=0.6) -> int:
+    reps = []
+    for it in items:
+        words = shingles(it["title"])
+        if not any(jaccard(words, r) >= threshold for r in reps):
+            reps.append(words)
+    return len(reps)
+
+def main(sizes):
+    print(f"{'stories':>8} {'items':>7} {'clusters':>9} {'purity':>7} {'lsh ms':>8} {'us/item':>8} {'pairs ms':>9}")
+    for n in sizes:
+        items, stories = _headlines(n)
+        t0 = time.perf_counter()
+        clusters = cluster(items)
+        t_lsh = time.perf_counter() - t0
+
+        # share of clusters holding a single story (no false merges)
+        pure = sum(1 for c in clusters if len({m["story"] for m in c.members}) == 1) / len(clusters)
+
+        t_pairs = ""
+        if len(items) <= 5000:
+            t0 = time.perf_counter()
+            _all_pairs(items)
+            t_pairs = f"{(time.perf_counter() - t0) * 1000:9.0f}"
+        print(f"{stories:>8} {len(items):>7} {len(clusters):>9} {pure:>7.3f} "
+              f"{t_lsh * 1000:>8.0f} {t_lsh / len(items) * 1e6:>8.1f} {t_pairs:>9}")
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [500, 1000, 2000, 4000])
@@ -0,0 +1,59 @@
+# bench_risk.py
+"""
+Checks the vectorized risk scorer against the scalar one and times both.
+
+    python bench_risk.py [N]
+
+Inputs are random but deliberately pile up on the threshold edges (exact
+100k / 400k / 500k liquidity, FDV ratios of 50 / 60, zero and NaN values)
+so any off-by-one in a comparison shows up as a mismatch.
+"""
+import sys
+import time
+
+import numpy as np
+
+from risk import LEVELS, risk_level, risk_levels
+
+def _columns(n: int, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    liq = 10 ** rng.uniform(0, 7, n)
+    vol = 10 ** rng.uniform(0, 7, n)
+    ratio = rng.uniform(0, 120, n)
+
+    edges = rng.random(n) < 0.3
+    liq[edges] = rng.choice([0.0, 100_000.0, 400_000.0, 500_000.0, np.nan], edges.sum())
+    vol_edges = rng.random(n) < 0.3
+    vol[vol_edges] = rng.choice([0.0, 50_000.0, 200_000.0, 300_000.0], vol_edges.sum())
+    ratio_edges = rng.random(n) < 0.3
+    ratio[ratio_edges] = rng.choice([50.0, 60.0], ratio_edges.sum())
+
+    fdv = np.nan_to_num(liq) * ratio
+    lp = rng.random(n) < 0.5
+    return liq, vol, fdv, lp
+
+def main(n: int = 200_000):
+    liq, vol, fdv, lp = _columns(n)
+    rows = list(zip(liq.tolist(), vol.tolist(), fdv.tolist(), lp.tolist()))
+
+    t0 = time.perf_counter()
+    scalar = [risk_level(*r) for r in rows]
+    t_scalar = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    codes = risk_levels(liq, vol, fdv, lp)
+    t_vector = time.perf_counter() - t0
+
+    vector = [LEVELS[c] for c in codes.tolist()]
+    mismatches = sum(a != b for a, b in zip(scalar, vector))
+    counts = {l: vector.count(l) for l in LEVELS}
+
+    print(f"tokens:      {n:,}")
+    print(f"levels:      {counts}")
+    print(f"scalar:      {t_scalar * 1000:8.1f} ms")
+    print(f"vectorized:  {t_vector * 1000:8.1f} ms  ({t_scalar / t_vector:,.0f}x)")
+    print(f"mismatches:  {mismatches}")
+    return 1 if mismatches else 0
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000))
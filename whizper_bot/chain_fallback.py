@@ -1,6 +1,11 @@
 # chain_fallback.py
+import asyncio
 import os
-import requests
+import threading
+import time
+
+import http_client
+from config import CONFIG
 
 BIRDEYE_API_KEY = os.getenv("BIRDEYE_API_KEY")
 BITQUERY_API_KEY = os.getenv("BITQUERY_API_KEY")
@@ -8,21 +13,26 @@ ETHERSCAN_API_KEY = os.getenv("ETHERSCAN_API_KEY")
 BASESCAN_API_KEY = os.getenv("BASESCAN_API_KEY")
 SOLSCAN_API_KEY = os.getenv("SOLSCAN_API_KEY")
 
-HEADERS = {"accept": "application/json", "User-Agent": "WhizperAI/1.0"}
+# provider preference per chain (override with FALLBACK_ORDER_<CHAIN>="a,b")
+_DEFAULT_ORDER = {
+    "solana": ["solscan", "birdeye_solana"],
+    "sui": ["birdeye_sui"],
+    "ethereum": ["etherscan_verified", "etherscan"],
+    "base": ["basescan_verified", "basescan"],
+}
 
-def fallback_fetch(chain: str, contract: str):
+async def fallback_fetch_async(chain: str, contract: str):
     """
     Last-resort contract intel when Dexscreener fails.
     Keep this file focused ONLY on fallbacks (no Dexscreener helpers here).
+
+    FALLBACK_MODE picks how a chain's providers are tried:
+      serial - one after another (the old behaviour)
+      hedge  - start the next provider if nothing answered within FALLBACK_HEDGE_DELAY
+      race   - start them all at once
+    The first acceptable answer wins; a lower-preference answer waits up to
+    FALLBACK_PREFER_GRACE for a better one still in flight. Losers are cancelled.
     """
-    if chain == "solana":
-        return fetch_from_solana_solscan(contract) or fetch_from_birdeye_solana(contract)
-    if chain == "sui":
-        return fetch_from_birdeye_sui(contract)
-    if chain == "ethereum":
-        return fetch_from_etherscan_verified(contract) or fetch_from_etherscan(contract)
-    if chain == "base":
-        return fetch_from_basescan_verified(contract) or fetch_from_basescan(contract)
     if chain == "abstract":
         return {
             "name": "Unknown", "price": "0", "volume": "0", "liquidity": "0",
@@ -30,17 +40,123 @@ def fallback_fetch(chain: str, contract: str):
             "holders": "N/A",
             "whiz_note": "🧪 Abstract layer: data thin, wisdom thick. —Whizper"
         }
-    return None
+    names = [n for n in (CONFIG.get("FALLBACK_ORDER", {}).get(chain) or _DEFAULT_ORDER.get(chain, []))
+             if n in _FETCHERS]
+    if not names:
+        return None
+
+    mode = CONFIG.get("FALLBACK_MODE", "hedge")
+    if mode == "serial" or len(names) == 1:
+        for name in names:
+            _bump(name, "calls")
+            res = await _timed(name, contract)
+            if res:
+                _bump(name, "wins")
+                return res
+        return None
+    hedge_delay = CONFIG.get("FALLBACK_HEDGE_DELAY", 1.5) if mode == "hedge" else None
+    return await _race(names, contract, hedge_delay, CONFIG.get("FALLBACK_PREFER_GRACE", 0.3))
+
+# ---------------- racing / stats ----------------
+
+_stats: dict = {}
+_stats_lock = threading.Lock()
+
+def _bump(name: str, field: str, n: int = 1):
+    with _stats_lock:
+        st = _stats.setdefault(name, {"calls": 0, "wins": 0, "errors": 0, "cancelled": 0,
+                                      "completed": 0, "latency_ms_total": 0.0})
+        st[field] += n
+
+async def _timed(name: str, contract: str):
+    t0 = time.monotonic()
+    try:
+        res = await _FETCHERS[name](contract)
+    except asyncio.CancelledError:
+        _bump(name, "cancelled")
+        raise
+    except Exception:
+        res = None
+    _bump(name, "completed")
+    _bump(name, "latency_ms_total", (time.monotonic() - t0) * 1000)
+    if not res:
+        _bump(name, "errors")
+    return res
+
+async def _race(names: list, contract: str, hedge_delay: float | None, grace: float):
+    loop = asyncio.get_running_loop()
+    queue = list(names)
+    running: dict = {}   # task -> provider name
+    results: dict = {}   # provider name -> result (None on failure)
+
+    def launch():
+        name = queue.pop(0)
+        _bump(name, "calls")
+        running[asyncio.ensure_future(_timed(name, contract))] = name
+
+    launch()
+    while hedge_delay is None and queue:
+        launch()
+
+    winner, grace_until = None, None
+    try:
+        while running or queue:
+            best = next((n for n in names if results.get(n)), None)
+            if best:
+                rank = names.index(best)
+                better_in_flight = any(names.index(n) < rank for n in running.values())
+                if not better_in_flight or (grace_until and loop.time() >= grace_until):
+                    winner = best
+                    break
+                if grace_until is None:
+                    grace_until = loop.time() + grace
+            if not running:
+                launch()
+                continue
+
+            timeout = hedge_delay if (queue and hedge_delay is not None) else None
+            if grace_until is not None:
+                left = max(0.0, grace_until - loop.time())
+                timeout = left if timeout is None else min(timeout, left)
+            done, _ = await asyncio.wait(running.keys(), timeout=timeout,
+                                         return_when=asyncio.FIRST_COMPLETED)
+            if not done and queue and grace_until is None:
+                launch()  # hedge: nothing back yet, bring in the next provider
+            for t in done:
+                results[running.pop(t)] = t.result()
+        if winner is None:
+            winner = next((n for n in names if results.get(n)), None)
+    finally:
+        for t in running:
+            t.cancel()
+
+    if winner is None:
+        return None
+    _bump(winner, "wins")
+    return results[winner]
+
+def fallback_stats() -> dict:
+    """Per-provider calls / wins / errors / cancellations and mean latency (ms)."""
+    with _stats_lock:
+        out = {}
+        for name, st in _stats.items():
+            row = {k: v for k, v in st.items() if k != "latency_ms_total"}
+            row["avg_latency_ms"] = round(st["latency_ms_total"] / st["completed"], 1) if st["completed"] else None
+            out[name] = row
+        return out
+
+def fallback_fetch(chain: str, contract: str):
+    """Blocking wrapper for sync callers."""
+    return http_client.run_sync(fallback_fetch_async(chain, contract))
 
 # ---------------- SOLANA ----------------
 
-def fetch_from_solana_solscan(contract: str):
+async def fetch_from_solana_solscan_async(contract: str):
     try:
         url = f"https://public-api.solscan.io/token/meta?tokenAddress={contract}"
-        r = requests.get(url, headers={"accept": "application/json"}, timeout=20)
-        if not r.ok:
+        data = await http_client.aget_json(url, "solscan")
+        if data is None:
             return None
-        data = r.json() or {}
         return {
             "name": data.get("tokenName", "Unknown"),
             "price": data.get("priceUsdt", "0"),
@@ -55,11 +171,10 @@ def fetch_from_solana_solscan(contract: str):
     except Exception:
         return None
 
-def fetch_from_birdeye_solana(contract: str):
+async def fetch_from_birdeye_solana_async(contract: str):
     try:
         url = f"https://public-api.birdeye.so/public/token/{contract}"
-        r = requests.get(url, headers={"X-API-KEY": BIRDEYE_API_KEY}, timeout=20)
-        data = (r.json() or {}).get("data", {}) if r.ok else {}
+        data = (await http_client.aget_json(url, "birdeye", headers={"X-API-KEY": BIRDEYE_API_KEY}) or {}).get("data", {})
         return {
             "name": data.get("symbol", "Unknown"),
             "price": data.get("value", "0"),
@@ -76,11 +191,10 @@ def fetch_from_birdeye_solana(contract: str):
 
 # ---------------- SUI ----------------
 
-def fetch_from_birdeye_sui(contract: str):
+async def fetch_from_birdeye_sui_async(contract: str):
     try:
         url = f"https://public-api.birdeye.so/public/token/{contract}?chain=sui"
-        r = requests.get(url, headers={"X-API-KEY": BIRDEYE_API_KEY}, timeout=20)
-        data = (r.json() or {}).get("data", {}) if r.ok else {}
+        data = (await http_client.aget_json(url, "birdeye", headers={"X-API-KEY": BIRDEYE_API_KEY}) or {}).get("data", {})
         return {
             "name": data.get("symbol", "Unknown"),
             "price": data.get("value", "0"),
@@ -97,14 +211,13 @@ def fetch_from_birdeye_sui(contract: str):
 
 # ---------------- ETHEREUM ----------------
 
-def fetch_from_etherscan_verified(contract: str):
+async def fetch_from_etherscan_verified_async(contract: str):
     try:
         url = (
             "https://api.etherscan.io/api"
             f"?module=contract&action=getsourcecode&address={contract}&apikey={ETHERSCAN_API_KEY}"
         )
-        r = requests.get(url, headers=HEADERS, timeout=20)
-        data = (r.json() or {}).get("result", [])
+        data = (await http_client.aget_json(url, "etherscan") or {}).get("result", [])
         first = data[0] if data else {}
         return {
             "name": first.get("ContractName", "Unknown"),
@@ -120,14 +233,13 @@ def fetch_from_etherscan_verified(contract: str):
     except Exception:
         return None
 
-def fetch_from_etherscan(contract: str):
+async def fetch_from_etherscan_async(contract: str):
     try:
         url = (
             "https://api.etherscan.io/api"
             f"?module=token&action=tokeninfo&contractaddress={contract}&apikey={ETHERSCAN_API_KEY}"
         )
-        r = requests.get(url, headers=HEADERS, timeout=20)
-        data = (r.json().get("result") or [{}])[0] if r.ok else {}
+        data = ((await http_client.aget_json(url, "etherscan") or {}).get("result") or [{}])[0]
         return {
             "name": data.get("symbol", "Unknown"),
             "price": "0", "volume": "0", "liquidity": "0",
@@ -142,14 +254,13 @@ def fetch_from_etherscan(contract: str):
 
 # ---------------- BASE ----------------
 
-def fetch_from_basescan_verified(contract: str):
+async def fetch_from_basescan_verified_async(contract: str):
     try:
         url = (
             "https://api.basescan.org/api"
             f"?module=contract&action=getsourcecode&address={contract}&apikey={BASESCAN_API_KEY}"
         )
-        r = requests.get(url, headers=HEADERS, timeout=20)
-        data = (r.json() or {}).get("result", [])
+        data = (await http_client.aget_json(url, "basescan") or {}).get("result", [])
         first = data[0] if data else {}
         return {
             "name": first.get("ContractName", "Unknown"),
@@ -161,14 +272,13 @@ def fetch_from_basescan_verified(contract: str):
     except Exception:
         return None
 
-def fetch_from_basescan(contract: str):
+async def fetch_from_basescan_async(contract: str):
     try:
         url = (
             "https://api.basescan.org/api"
             f"?module=token&action=tokeninfo&contractaddress={contract}&apikey={BASESCAN_API_KEY}"
         )
-        r = requests.get(url, headers=HEADERS, timeout=20)
-        data = (r.json().get("result") or [{}])[0] if r.ok else {}
+        data = ((await http_client.aget_json(url, "basescan") or {}).get("result") or [{}])[0]
         return {
             "name": data.get("symbol", "Unknown"),
             "price": "0", "volume": "0", "liquidity": "0",
@@ -179,4 +289,15 @@ def fetch_from_basescan(contract: str):
             "whiz_note": "📦 Basic Basescan intel — stay amphibious.",
         }
     except Exception:
-        return None
\ No newline at end of file
+        return None
+
+# provider name -> fetcher (referenced by _DEFAULT_ORDER / FALLBACK_ORDER_*)
+_FETCHERS = {
+    "solscan": fetch_from_solana_solscan_async,
+    "birdeye_solana": fetch_from_birdeye_solana_async,
+    "birdeye_sui": fetch_from_birdeye_sui_async,
+    "etherscan_verified": fetch_from_etherscan_verified_async,
+    "etherscan": fetch_from_etherscan_async,
+    "basescan_verified": fetch_from_basescan_verified_async,
+    "basescan": fetch_from_basescan_async,
+}
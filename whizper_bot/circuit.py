@@ -0,0 +1,127 @@
+# circuit.py
+"""
+Per-upstream circuit breakers.
+
+Each breaker keeps a rolling window of outcomes (errors, 5xx and calls slower
+than `slow_call` count as failures; a 429 is the rate limiter's business, see
+rate_limit.py, and does not count). Once the window holds `min_calls` and
+the failure rate reaches `error_rate` it trips open and calls fail fast with
+CircuitOpenError for `open_for` seconds. After that a single
+half-open probe is let through: success closes the breaker, failure re-opens it.
+
+`allow()` hands out a ticket (CALL, or PROBE for the half-open probe) that
+goes back with the outcome. While half-open only the probe's outcome counts;
+late results from calls started before the trip are ignored.
+"""
+import threading
+import time
+from collections import deque
+
+from config import CONFIG
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+CALL, PROBE = "call", "probe"
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose breaker is open."""
+
+class CircuitBreaker:
+    def __init__(self, name: str, window: float = 60, min_calls: int = 5,
+                 error_rate: float = 0.5, slow_call: float = 8.0, open_for: float = 30):
+        self.name = name
+        self.window = window
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.slow_call = slow_call
+        self.open_for = open_for
+        self.state = CLOSED
+        self._calls = deque()  # (ts, ok, latency)
+        self._opened_at = 0.0
+        self._probe_out = False
+        self._trips = 0
+        self._rejected = 0
+        self._lock = threading.Lock()
+
+    def _prune(self, now: float):
+        while self._calls and now - self._calls[0][0] > self.window:
+            self._calls.popleft()
+
+    def allow(self) -> str:
+        """CALL or PROBE if the call may go ahead, "" if it must fail fast."""
+        now = time.monotonic()
+        with self._lock:
+            if self.state == OPEN and now - self._opened_at >= self.open_for:
+                self.state, self._probe_out = HALF_OPEN, False
+            if self.state == CLOSED:
+                return CALL
+            if self.state == HALF_OPEN and not self._probe_out:
+                self._probe_out = True
+                return PROBE
+            self._rejected += 1
+            return ""
+
+    def record(self, ok: bool, latency: float, ticket: str = CALL):
+        now = time.monotonic()
+        ok = ok and latency <= self.slow_call
+        with self._lock:
+            if self.state == HALF_OPEN:
+                if ticket != PROBE:
+                    return  # a call from before the trip finishing late
+                self._probe_out = False
+                if ok:
+                    self.state = CLOSED
+                    self._calls.clear()
+                else:
+                    self._trip(now)
+                return
+            self._calls.append((now, ok, latency))
+            self._prune(now)
+            if self.state == CLOSED and len(self._calls) >= self.min_calls:
+                failures = sum(1 for _, good, _ in self._calls if not good)
+                if failures / len(self._calls) >= self.error_rate:
+                    self._trip(now)
+
+    def abandon(self, ticket: str = CALL):
+        """The call was cancelled before it finished: free the half-open probe slot."""
+        with self._lock:
+            if self.state == HALF_OPEN and ticket == PROBE:
+                self._probe_out = False
+
+    def _trip(self, now: float):
+        self.state = OPEN
+        self._opened_at = now
+        self._trips += 1
+
+    def snapshot(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            self._prune(now)
+            n = len(self._calls)
+            failures = sum(1 for _, good, _ in self._calls if not good)
+            lat = sorted(l for _, _, l in self._calls)
+            return {
+                "state": self.state,
+                "calls": n,
+                "error_rate": round(failures / n, 3) if n else 0.0,
+                "p50_ms": round(lat[n // 2] * 1000, 1) if n else None,
+                "max_ms": round(lat[-1] * 1000, 1) if n else None,
+                "trips": self._trips,
+                "rejected": self._rejected,
+                "retry_in_s": round(max(0.0, self.open_for - (now - self._opened_at)), 1)
+                              if self.state == OPEN else 0.0,
+            }
+
+_breakers: dict = {}
+_breakers_lock = threading.Lock()
+
+def breaker(name: str) -> CircuitBreaker:
+    b = _breakers.get(name)
+    if b is None:
+        with _breakers_lock:
+            b = _breakers.get(name)
+            if b is None:
+                b = _breakers[name] = CircuitBreaker(name, **CONFIG.get("CIRCUIT", {}))
+    return b
+
+def snapshot() -> dict:
+    return {name: b.snapshot() for name, b in sorted(_breakers.items())}
@@ -5,12 +5,135 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Client-side rate limits per upstream host: requests/min and burst.
+# Override with RATE_LIMIT_<NAME>="per_min:burst" (e.g. RATE_LIMIT_DEXSCREENER="240:20").
+_RATE_LIMITS = {
+    "api.dexscreener.com": ("DEXSCREENER", 300, 30),
+    "public-api.solscan.io": ("SOLSCAN", 120, 10),
+    "public-api.birdeye.so": ("BIRDEYE", 60, 5),
+    "api.etherscan.io": ("ETHERSCAN", 300, 5),
+    "api.basescan.org": ("BASESCAN", 300, 5),
+    "api.coingecko.com": ("COINGECKO", 30, 5),
+    "open-api.coinglass.com": ("COINGLASS", 30, 5),
+}
+
+def _rate_limits() -> dict:
+    out = {}
+    for host, (name, per_min, burst) in _RATE_LIMITS.items():
+        raw = os.getenv(f"RATE_LIMIT_{name}", "")
+        if raw:
+            try:
+                p, _, b = raw.partition(":")
+                p, b = float(p), float(b or burst)
+                if p <= 0 or b < 1:
+                    raise ValueError("per_min must be > 0 and burst >= 1")
+                per_min, burst = p, b
+            except ValueError as e:
+                print(f"RATE_LIMIT_{name}={raw!r} ignored, using {per_min}:{burst}:", e)
+        out[host] = {"per_min": float(per_min), "burst": float(burst)}
+    return out
+
+# Per-provider request timeouts (seconds). Override any of them with HTTP_TIMEOUT_<PROVIDER>.
+_HTTP_TIMEOUTS = {
+    "dexscreener": 10,
+    "solscan": 10,
+    "birdeye": 10,
+    "etherscan": 10,
+    "basescan": 10,
+    "coingecko": 15,
+    "coinglass": 20,
+    "rss": 8,
+    "default": 20,
+}
+
 CONFIG = {
     "TELEGRAM_BOT_TOKEN": os.getenv("TELEGRAM_BOT_TOKEN"),
     "DEXSCREENER_API": os.getenv("DEXSCREENER_API", "https://api.dexscreener.com/latest/dex"),
     "ENVIRONMENT": os.getenv("ENVIRONMENT", "development"),
     "SUPPORTED_CHAINS": ["solana", "ethereum", "base", "sui", "abstract"],
     "DEFAULT_HEADERS": {
-        "User-Agent": "WhizperAI/1.0"
-    }
+        "User-Agent": "WhizperAI/1.0",
+        "Accept": "application/json",
+    },
+    # keep-alive pools: how many hosts we keep pools for, and sockets per host
+    "HTTP_POOL_CONNECTIONS": int(os.getenv("HTTP_POOL_CONNECTIONS", "16")),
+    "HTTP_POOL_MAXSIZE": int(os.getenv("HTTP_POOL_MAXSIZE", "32")),
+    "HTTP_TIMEOUTS": {
+        p: float(os.getenv(f"HTTP_TIMEOUT_{p.upper()}", t)) for p, t in _HTTP_TIMEOUTS.items()
+    },
+    # overall budget (seconds) for the concurrent Solscan enrichment calls
+    "SOLANA_ENRICH_DEADLINE": float(os.getenv("SOLANA_ENRICH_DEADLINE", "3")),
+    # chain fallbacks: serial | hedge | race, plus per-chain provider order overrides
+    "FALLBACK_MODE": os.getenv("FALLBACK_MODE", "hedge"),
+    "FALLBACK_HEDGE_DELAY": float(os.getenv("FALLBACK_HEDGE_DELAY", "1.5")),
+    "FALLBACK_PREFER_GRACE": float(os.getenv("FALLBACK_PREFER_GRACE", "0.3")),
+    "FALLBACK_ORDER": {
+        ch: [n.strip() for n in os.getenv(f"FALLBACK_ORDER_{ch.upper()}", "").split(",") if n.strip()]
+        for ch in ("solana", "sui", "ethereum", "base")
+    },
+    # per-upstream circuit breakers (see circuit.py)
+    "CIRCUIT": {
+        "window": float(os.getenv("CIRCUIT_WINDOW", "60")),
+        "min_calls": int(os.getenv("CIRCUIT_MIN_CALLS", "5")),
+        "error_rate": float(os.getenv("CIRCUIT_ERROR_RATE", "0.5")),
+        "slow_call": float(os.getenv("CIRCUIT_SLOW_CALL", "8")),
+        "open_for": float(os.getenv("CIRCUIT_OPEN_FOR", "30")),
+    },
+    "RATE_LIMITS": _rate_limits(),
+    # how long each lane may queue for a token; background keeps this share of the bucket free
+    "RATE_LIMIT_MAX_WAIT": {
+        "interactive": float(os.getenv("RATE_LIMIT_WAIT_INTERACTIVE", "5")),
+        "background": float(os.getenv("RATE_LIMIT_WAIT_BACKGROUND", "30")),
+    },
+    "RATE_LIMIT_BACKGROUND_RESERVE": float(os.getenv("RATE_LIMIT_BACKGROUND_RESERVE", "0.25")),
+    # how long one daily-report snapshot (movers, liquidations, BTC 24h) is reused
+    "DAILY_REPORT_TTL": float(os.getenv("DAILY_REPORT_TTL", "600")),
+    # ...and how long one where every source failed is, before trying again
+    "DAILY_REPORT_FAILED_TTL": float(os.getenv("DAILY_REPORT_FAILED_TTL", "30")),
+    # RSS feeds are downloaded concurrently; slower feeds are dropped at this deadline
+    "NEWS_FETCH_DEADLINE": float(os.getenv("NEWS_FETCH_DEADLINE", "12")),
+    # ETag / Last-Modified feed cache persisted across restarts; NEWS_FEED_CACHE="" keeps it in memory
+    "NEWS_FEED_CACHE": os.getenv("NEWS_FEED_CACHE", "whizper_feed_cache.json"),
+    # headline sentiment memo (VADER runs once per headline); NEWS_SENTIMENT_CACHE="" keeps it in memory
+    "NEWS_SENTIMENT_CACHE": os.getenv("NEWS_SENTIMENT_CACHE", "whizper_sentiment_cache.json"),
+    "NEWS_SENTIMENT_CACHE_SIZE": int(os.getenv("NEWS_SENTIMENT_CACHE_SIZE", "5000")),
+    # ingested headlines (SQLite) that summarize_market_news queries by time window
+    "NEWS_DB": os.getenv("NEWS_DB", "whizper_news.db"),
+    "NEWS_KEEP_DAYS": float(os.getenv("NEWS_KEEP_DAYS", "14")),
+    # one ingester crawls the feeds on this schedule; everything else reads the store.
+    # The sharing only holds for processes that see the same NEWS_DB file: separate
+    # services (e.g. Render's cron vs. worker, each with its own disk) crawl for themselves.
+    "NEWS_INGEST_EVERY": float(os.getenv("NEWS_INGEST_EVERY", "600")),
+    # after Google Trends rate-limits us, serve cached values for this long before retrying
+    "TRENDS_BACKOFF": float(os.getenv("TRENDS_BACKOFF", "900")),
+    # movers engine: background ingest of /tokens pairs, ranked per price-change window
+    "MOVERS": {
+        "windows": tuple(w.strip() for w in os.getenv("MOVERS_WINDOWS", "h1,h6,h24").split(",") if w.strip()),
+        "min_liquidity": float(os.getenv("MOVERS_MIN_LIQUIDITY", "10000")),
+        "min_volume": float(os.getenv("MOVERS_MIN_VOLUME", "5000")),
+        "refresh_every": float(os.getenv("MOVERS_REFRESH_EVERY", "300")),
+        "max_age": float(os.getenv("MOVERS_MAX_AGE", "1800")),
+    },
+    # local snapshot history (SQLite); SNAPSHOT_DB="" turns it off
+    "SNAPSHOT_STORE": {
+        "path": os.getenv("SNAPSHOT_DB", "whizper_snapshots.db"),
+        "min_interval": float(os.getenv("SNAPSHOT_MIN_INTERVAL", "60")),
+        "raw_hours": float(os.getenv("SNAPSHOT_RAW_HOURS", "48")),
+        "keep_days": float(os.getenv("SNAPSHOT_KEEP_DAYS", "30")),
+    },
+    # per-chat watchlists: one background poll for every unique watched token
+    "WATCHLIST": {
+        "path": os.getenv("WATCHLIST_PATH", "whizper_watchlist.json"),
+        "poll_every": float(os.getenv("WATCHLIST_POLL_EVERY", "120")),
+        "price_pct": float(os.getenv("WATCHLIST_PRICE_PCT", "10")),
+        "liq_drop_pct": float(os.getenv("WATCHLIST_LIQ_DROP_PCT", "25")),
+        "max_per_chat": int(os.getenv("WATCHLIST_MAX_PER_CHAT", "25")),
+    },
+    # token lookup cache: price/volume go stale fast, holders/authorities/age slowly
+    "TOKEN_CACHE": {
+        "market_ttl": float(os.getenv("TOKEN_CACHE_MARKET_TTL", "15")),
+        "meta_ttl": float(os.getenv("TOKEN_CACHE_META_TTL", "300")),
+        "max_stale": float(os.getenv("TOKEN_CACHE_MAX_STALE", "120")),
+        "max_entries": int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", "2048")),
+    },
 }
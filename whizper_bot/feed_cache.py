@@ -0,0 +1,133 @@
+# feed_cache.py
+"""
+Conditional-GET cache for RSS feeds.
+
+Per feed URL it keeps the last body plus its ETag / Last-Modified, so the
+next download can ask "changed since?" and treat a 304 as a hit. The parsed
+feed is memoized next to the body and only rebuilt when the body changes,
+which makes an idle feed cost one tiny request and no parse CPU.
+
+Bodies and validators can persist to a JSON file, so cron-style entry points
+(x_bot) keep their validators across runs.
+"""
+import base64
+import json
+import os
+import threading
+import time
+
+class _Feed:
+    __slots__ = ("body", "etag", "last_modified", "fetched_ts", "parsed")
+
+    def __init__(self, body, etag=None, last_modified=None, fetched_ts=0.0):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_ts = fetched_ts
+        self.parsed = None
+
+class FeedCache:
+    def __init__(self, path: str | None = None):
+        self.path = path
+        self._feeds: dict[str, _Feed] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._counts = {"not_modified": 0, "changed": 0, "parses": 0, "parse_hits": 0, "stale_served": 0}
+        self._load()
+
+    def validators(self, url: str) -> dict:
+        """Conditional request headers for url ({} when nothing is cached)."""
+        f = self._feeds.get(url)
+        if f is None:
+            return {}
+        h = {}
+        if f.etag:
+            h["If-None-Match"] = f.etag
+        if f.last_modified:
+            h["If-Modified-Since"] = f.last_modified
+        return h
+
+    def not_modified(self, url: str) -> bytes | None:
+        """Record a 304 and return the cached body."""
+        with self._lock:
+            f = self._feeds.get(url)
+            if f is None:
+                return None
+            f.fetched_ts = time.time()
+            self._counts["not_modified"] += 1
+            return f.body
+
+    def store(self, url: str, body: bytes, etag: str | None, last_modified: str | None) -> bytes:
+        with self._lock:
+            f = self._feeds.get(url)
+            if f is not None and f.body == body:
+                # same document re-sent in full (no validator support): keep the parse
+                if (f.etag, f.last_modified) != (etag, last_modified):
+                    f.etag, f.last_modified = etag, last_modified
+                    self._dirty = True
+                f.fetched_ts = time.time()
+            else:
+                self._feeds[url] = _Feed(body, etag, last_modified, time.time())
+                self._counts["changed"] += 1
+                self._dirty = True
+            return body
+
+    def last_good(self, url: str) -> bytes | None:
+        """Cached body for a feed whose download just failed."""
+        f = self._feeds.get(url)
+        if f is not None:
+            self._counts["stale_served"] += 1
+            return f.body
+        return None
+
+    def parsed(self, url: str, parse):
+        """parse(body) for url's cached body, memoized until the body changes."""
+        f = self._feeds.get(url)
+        if f is None:
+            return None
+        if f.parsed is None:
+            f.parsed = parse(f.body)
+            self._counts["parses"] += 1
+        else:
+            self._counts["parse_hits"] += 1
+        return f.parsed
+
+    # ---------- persistence ----------
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as fh:
+                raw = json.load(fh)
+            for url, d in raw.items():
+                self._feeds[url] = _Feed(base64.b64decode(d["body"]), d.get("etag"),
+                                         d.get("last_modified"), d.get("fetched_ts", 0.0))
+        except Exception as e:
+            print("feed cache load error:", e)
+
+    def save(self):
+        """Write to disk if anything changed since the last save."""
+        if not self.path or not self._dirty:
+            return
+        with self._lock:
+            raw = {
+                url: {
+                    "body": base64.b64encode(f.body).decode("ascii"),
+                    "etag": f.etag,
+                    "last_modified": f.last_modified,
+                    "fetched_ts": f.fetched_ts,
+                }
+                for url, f in self._feeds.items()
+            }
+            self._dirty = False
+        tmp = f"{self.path}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as fh:
+                json.dump(raw, fh)
+            os.replace(tmp, self.path)
+        except Exception as e:
+            print("feed cache save error:", e)
+
+    def stats(self) -> dict:
+        return dict(self._counts, feeds=len(self._feeds))
@@ -0,0 +1,262 @@
+# http_client.py
+"""
+Shared pooled HTTP client for every upstream market-data call.
+
+One requests.Session with keep-alive pools per host, so repeat lookups against
+Dexscreener / Solscan / Birdeye / *scan skip the TCP+TLS handshake.
+Callers name a provider to pick up its timeout from CONFIG["HTTP_TIMEOUTS"];
+every call also runs through that upstream's circuit breaker (see circuit.py),
+keyed by `upstream` when one provider has several endpoints worth tracking,
+and takes a token from its host's rate-limit bucket first (see rate_limit.py).
+A 429 is retried once after its Retry-After when that fits the caller's lane.
+Async calls made inside `deadline()` that get cancelled at or past it count
+as slow failures, so an upstream that always hangs still trips its breaker.
+
+The async side mirrors it with one aiohttp session per event loop, so the
+Telegram / FastAPI handlers never block their loop on an upstream. Sync code
+that needs the async pipeline goes through `run_sync`, which drives it on a
+long-lived background loop (its session and pools survive between calls).
+aiohttp itself is imported on first async use, so sync-only entry points
+(cron scripts) never pay for it.
+"""
+import asyncio
+import concurrent.futures
+import contextvars
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+
+import circuit
+import rate_limit
+from circuit import CircuitOpenError
+from config import CONFIG
+
+_session = None
+_session_lock = threading.Lock()
+
+def _default_headers() -> dict:
+    h = dict(CONFIG.get("DEFAULT_HEADERS", {}))
+    # gzip/deflate always; br too when a brotli decoder is installed
+    h["Accept-Encoding"] = make_headers(accept_encoding=True)["accept-encoding"]
+    return h
+
+def session() -> requests.Session:
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                s = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=CONFIG.get("HTTP_POOL_CONNECTIONS", 16),
+                    pool_maxsize=CONFIG.get("HTTP_POOL_MAXSIZE", 32),
+                )
+                s.mount("https://", adapter)
+                s.mount("http://", adapter)
+                s.headers.update(_default_headers())
+                _session = s
+    return _session
+
+def timeout_for(provider: str) -> float:
+    timeouts = CONFIG.get("HTTP_TIMEOUTS", {})
+    return timeouts.get(provider) or timeouts.get("default", 20)
+
+def _upstream_ok(status: int) -> bool:
+    # 4xx means "not found / bad input", not "upstream is sick"; 429s belong to the rate limiter
+    return status < 500
+
+def _open_breaker(provider: str, upstream: str | None) -> tuple[circuit.CircuitBreaker, str]:
+    br = circuit.breaker(upstream or provider)
+    ticket = br.allow()
+    if not ticket:
+        raise CircuitOpenError(f"{br.name} circuit open")
+    return br, ticket
+
+_deadline: contextvars.ContextVar = contextvars.ContextVar("http_deadline", default=None)
+
+@contextmanager
+def deadline(seconds: float):
+    """Tasks created inside share this deadline (contextvars are copied into tasks)."""
+    token = _deadline.set(time.monotonic() + seconds)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+def _should_retry_429(bucket, status: int, retry_after: str | None, attempt: int) -> bool:
+    if status != 429 or bucket is None:
+        return False
+    wait = rate_limit.retry_after_seconds(retry_after)
+    bucket.penalize(wait)
+    return attempt == 0 and wait <= rate_limit.max_wait()
+
+def get(url: str, provider: str = "default", upstream: str | None = None, **kwargs) -> requests.Response:
+    """GET through the shared pool. Extra headers are merged over the defaults."""
+    kwargs.setdefault("timeout", timeout_for(provider))
+    bucket = rate_limit.bucket_for(url)
+    for attempt in (0, 1):
+        if bucket:
+            bucket.acquire(rate_limit.current_lane(), rate_limit.max_wait())
+        r = _get_once(url, provider, upstream, **kwargs)
+        if not _should_retry_429(bucket, r.status_code, r.headers.get("Retry-After"), attempt):
+            return r
+    return r
+
+def _get_once(url: str, provider: str, upstream: str | None, **kwargs) -> requests.Response:
+    br, ticket = _open_breaker(provider, upstream)
+    t0 = time.monotonic()
+    try:
+        r = session().get(url, **kwargs)
+    except Exception:
+        br.record(False, time.monotonic() - t0, ticket)
+        raise
+    br.record(_upstream_ok(r.status_code), time.monotonic() - t0, ticket)
+    return r
+
+def get_json(url: str, provider: str = "default", upstream: str | None = None, **kwargs):
+    """Decoded JSON body on 2xx, None otherwise."""
+    r = get(url, provider, upstream, **kwargs)
+    return (r.json() or {}) if r.ok else None
+
+# ---------- async (aiohttp) ----------
+
+_async_sessions = weakref.WeakKeyDictionary()  # event loop -> ClientSession
+_async_counts = {"connections": 0, "reused": 0}
+
+def _trace_config() -> "aiohttp.TraceConfig":
+    import aiohttp
+    tc = aiohttp.TraceConfig()
+    async def _on_create(session, ctx, params):
+        _async_counts["connections"] += 1
+    async def _on_reuse(session, ctx, params):
+        _async_counts["reused"] += 1
+    tc.on_connection_create_end.append(_on_create)
+    tc.on_connection_reuseconn.append(_on_reuse)
+    return tc
+
+def async_session() -> "aiohttp.ClientSession":
+    """The aiohttp session bound to the running loop (created on first use)."""
+    loop = asyncio.get_running_loop()
+    s = _async_sessions.get(loop)
+    if s is None or s.closed:
+        import aiohttp
+        connector = aiohttp.TCPConnector(
+            limit=CONFIG.get("HTTP_POOL_CONNECTIONS", 16) * CONFIG.get("HTTP_POOL_MAXSIZE", 32),
+            limit_per_host=CONFIG.get("HTTP_POOL_MAXSIZE", 32),
+            keepalive_timeout=30,
+        )
+        s = aiohttp.ClientSession(
+            connector=connector,
+            headers=_default_headers(),
+            trace_configs=[_trace_config()],
+        )
+        _async_sessions[loop] = s
+    return s
+
+async def aget_json(url: str, provider: str = "default", headers: dict | None = None,
+                    params: dict | None = None, upstream: str | None = None):
+    """Async twin of get_json: decoded JSON on 2xx, None otherwise."""
+    # requests silently drops None-valued headers (e.g. a missing API key); aiohttp would raise
+    headers = {k: v for k, v in (headers or {}).items() if v is not None}
+    bucket = rate_limit.bucket_for(url)
+    for attempt in (0, 1):
+        if bucket:
+            await bucket.aacquire(rate_limit.current_lane(), rate_limit.max_wait())
+        status, body, retry_after = await _aget_once(url, provider, headers, params, upstream)
+        if not _should_retry_429(bucket, status, retry_after, attempt):
+            break
+    return (body or {}) if status < 400 else None
+
+async def _aget_once(url: str, provider: str, headers: dict, params: dict | None, upstream: str | None):
+    import aiohttp
+    timeout = aiohttp.ClientTimeout(total=timeout_for(provider))
+    br, ticket = _open_breaker(provider, upstream)
+    t0 = time.monotonic()
+    try:
+        async with async_session().get(url, headers=headers, params=params, timeout=timeout) as r:
+            status, retry_after = r.status, r.headers.get("Retry-After")
+            body = (await r.json(content_type=None)) if status < 400 else None
+    except asyncio.CancelledError:
+        now, due = time.monotonic(), _deadline.get()
+        if now - t0 >= br.slow_call or (due is not None and now >= due):
+            br.record(False, now - t0, ticket)  # cut off by the caller's deadline: a slow call
+        else:
+            br.abandon(ticket)  # e.g. a losing hedge: says nothing about the upstream
+        raise
+    except Exception:
+        br.record(False, time.monotonic() - t0, ticket)
+        raise
+    br.record(_upstream_ok(status), time.monotonic() - t0, ticket)
+    return status, body, retry_after
+
+# ---------- sync bridge ----------
+
+_bg_loop = None
+_bg_lock = threading.Lock()
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    global _bg_loop
+    if _bg_loop is None:
+        with _bg_lock:
+            if _bg_loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="http-client-loop", daemon=True).start()
+                _bg_loop = loop
+    return _bg_loop
+
+def run_sync(coro):
+    """Run a coroutine from sync code on the shared background loop and wait for it."""
+    loop = _background_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        raise RuntimeError("run_sync() called from the http-client loop; await the coroutine instead")
+    # carry the caller's contextvars (e.g. the rate-limit lane) onto the background loop
+    ctx = contextvars.copy_context()
+    fut = concurrent.futures.Future()
+
+    def _start():
+        task = loop.create_task(coro)
+        def _done(t):
+            if t.cancelled():
+                fut.cancel()
+            elif t.exception() is not None:
+                fut.set_exception(t.exception())
+            else:
+                fut.set_result(t.result())
+        task.add_done_callback(_done)
+
+    loop.call_soon_threadsafe(_start, context=ctx)
+    return fut.result()
+
+# ---------- stats ----------
+
+def pool_stats() -> dict:
+    """Per-host request vs. new-connection counts; `reused` is the handshakes we skipped."""
+    out = {"aiohttp": dict(_async_counts)}
+    if _session is None:
+        return out
+    seen = set()
+    for adapter in _session.adapters.values():
+        if id(adapter) in seen:
+            continue
+        seen.add(id(adapter))
+        pools = adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            opened, reqs = pool.num_connections, pool.num_requests
+            out[f"{pool.scheme}://{pool.host}"] = {
+                "requests": reqs,
+                "connections": opened,
+                "reused": max(0, reqs - opened),
+            }
+    return out
@@ -0,0 +1,251 @@
+# movers.py
+"""
+Background movers engine.
+
+Pair snapshots from Dexscreener are folded into a compact store, one record
+per base token (the best-liquidity pair wins). Each window (1h / 6h / 24h
+price change) keeps a gainers heap and a losers heap that are updated on
+ingest; superseded heap entries are dropped lazily when a query walks past
+them, so a read costs O(k log n) instead of a full sort.
+
+Records nobody has reported for `max_age` are evicted on a periodic sweep,
+so the store tracks what is live rather than every token ever looked up.
+Lookups on an event loop hand their pairs over with `offer()`, which never
+blocks; offered pairs are folded in by the next ingest, query or refresh.
+"""
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+
+import http_client
+from config import CONFIG
+
+_EXCLUDE = {"btc", "wbtc", "eth", "weth", "usdt", "usdc"}
+
+_WINDOW_ALIASES = {"1h": "h1", "6h": "h6", "24h": "h24"}
+
+class _Record:
+    __slots__ = ("key", "symbol", "chain", "pair", "liquidity", "volume", "changes", "ts", "seq")
+
+    def __init__(self, key, symbol, chain, pair, liquidity, volume, changes, ts, seq):
+        self.key = key
+        self.symbol = symbol
+        self.chain = chain
+        self.pair = pair
+        self.liquidity = liquidity
+        self.volume = volume
+        self.changes = changes
+        self.ts = ts
+        self.seq = seq
+
+def _num(v) -> float:
+    try:
+        return float(v or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+def window_key(name: str) -> str:
+    """Accepts '1h' / 'h1' style names and returns the Dexscreener priceChange key."""
+    name = (name or "").strip().lower()
+    return _WINDOW_ALIASES.get(name, name)
+
+class MoversEngine:
+    def __init__(self, windows=("h1", "h6", "h24"), min_liquidity: float = 10_000,
+                 min_volume: float = 5_000, max_age: float = 1800):
+        self.windows = tuple(windows)
+        self.min_liquidity = min_liquidity
+        self.min_volume = min_volume
+        self.max_age = max_age
+        self._records: dict[str, _Record] = {}
+        # per window: gainers heap of (-chg, seq, key), losers heap of (chg, seq, key)
+        self._up = {w: [] for w in self.windows}
+        self._down = {w: [] for w in self.windows}
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._offered = deque(maxlen=256)  # (ts, pairs) batches waiting to be folded in
+        self._last_sweep = 0.0
+        self.last_refresh = 0.0
+        self._counts = {"ingested": 0, "kept": 0, "filtered": 0, "evicted": 0,
+                        "refreshes": 0, "errors": 0}
+
+    # ---------- ingest ----------
+
+    def ingest(self, pairs) -> int:
+        """Fold raw Dexscreener pairs into the store. Returns how many records changed."""
+        now = time.time()
+        with self._lock:
+            self._drain_offered()
+            changed = self._ingest_batch(pairs, now)
+            self._maybe_compact(now)
+        return changed
+
+    def offer(self, pairs) -> None:
+        """Queue pairs for the next ingest/query without taking the lock (safe on an event loop)."""
+        if pairs:
+            self._offered.append((time.time(), pairs))
+
+    def _drain_offered(self):
+        while self._offered:
+            ts, pairs = self._offered.popleft()
+            self._ingest_batch(pairs, ts)
+
+    def _ingest_batch(self, pairs, now: float) -> int:
+        changed = 0
+        for p in pairs or []:
+            self._counts["ingested"] += 1
+            if self._ingest_one(p, now):
+                changed += 1
+        return changed
+
+    def _ingest_one(self, p: dict, now: float) -> bool:
+        base = p.get("baseToken") or {}
+        symbol = (base.get("symbol") or "").strip()
+        if not symbol or symbol.lower() in _EXCLUDE:
+            self._counts["filtered"] += 1
+            return False
+
+        chain = (p.get("chainId") or "").lower()
+        key = f"{chain}:{(base.get('address') or symbol).lower()}"
+        pair = p.get("pairAddress") or ""
+        liq = _num((p.get("liquidity") or {}).get("usd"))
+        vol = _num((p.get("volume") or {}).get("h24"))
+
+        # dedupe by base token: another pair only replaces the record if it is
+        # deeper, or the kept pair itself reports in, or the kept one went stale
+        old = self._records.get(key)
+        if old is not None and old.pair != pair and liq < old.liquidity and now - old.ts < self.max_age:
+            return False
+
+        pc = p.get("priceChange") or {}
+        changes = {w: _num(pc.get(w)) for w in self.windows if pc.get(w) is not None}
+        rec = _Record(key, symbol, chain, pair, liq, vol, changes, now, next(self._seq))
+        self._records[key] = rec
+
+        if liq < self.min_liquidity or vol < self.min_volume:
+            self._counts["filtered"] += 1
+            return True
+
+        for w, chg in changes.items():
+            heapq.heappush(self._up[w], (-chg, rec.seq, key))
+            heapq.heappush(self._down[w], (chg, rec.seq, key))
+        self._counts["kept"] += 1
+        return True
+
+    def _maybe_compact(self, now: float):
+        # evict records that stopped reporting, a few times per max_age
+        if now - self._last_sweep >= self.max_age / 4:
+            stale = [k for k, r in self._records.items() if now - r.ts >= self.max_age]
+            for k in stale:
+                del self._records[k]
+            self._counts["evicted"] += len(stale)
+            self._last_sweep = now
+        # lazy deletion leaves dead entries behind; rebuild once they dominate
+        live = len(self._records)
+        for w in self.windows:
+            if len(self._up[w]) > 4 * live + 64:
+                self._up[w] = [e for e in self._up[w] if self._valid(e, w, now)]
+                heapq.heapify(self._up[w])
+                self._down[w] = [e for e in self._down[w] if self._valid(e, w, now)]
+                heapq.heapify(self._down[w])
+
+    def _valid(self, entry, window: str, now: float | None = None) -> bool:
+        _, seq, key = entry
+        rec = self._records.get(key)
+        if rec is None or rec.seq != seq or window not in rec.changes:
+            return False
+        if now is not None and now - rec.ts >= self.max_age:
+            return False
+        return True
+
+    # ---------- queries ----------
+
+    def top(self, window: str = "h24", k: int = 5, gainers: bool = True) -> list[_Record]:
+        """Top-k records for a window, best first. Dead entries met on the way are discarded."""
+        window = window_key(window)
+        if window not in self.windows:
+            raise ValueError(f"unknown movers window: {window}")
+        now = time.time()
+        with self._lock:
+            self._drain_offered()
+            self._maybe_compact(now)
+            heap = (self._up if gainers else self._down)[window]
+            out, keep = [], []
+            while heap and len(out) < k:
+                entry = heapq.heappop(heap)
+                if not self._valid(entry, window, now):
+                    continue
+                keep.append(entry)
+                out.append(self._records[entry[2]])
+            for entry in keep:
+                heapq.heappush(heap, entry)
+        return out
+
+    def top_movers(self, window: str = "h24", k: int = 5):
+        """(gainers, losers) lists of strings like '$SYM (+12.3%)'."""
+        window = window_key(window)
+
+        def shape_str(r: _Record):
+            return f"${r.symbol} ({r.changes[window]:+,.1f}%)"
+
+        return ([shape_str(r) for r in self.top(window, k, gainers=True)],
+                [shape_str(r) for r in self.top(window, k, gainers=False)])
+
+    # ---------- refresh ----------
+
+    def refresh(self) -> bool:
+        """Pull the Dexscreener /tokens pairs list and ingest it. Sync; run off the event loop."""
+        try:
+            url = f"{CONFIG['DEXSCREENER_API']}/tokens"
+            pairs = http_client.get(url, "dexscreener", upstream="dexscreener:tokens").json().get("pairs", [])
+        except Exception as e:
+            self._counts["errors"] += 1
+            print("movers refresh error:", e)
+            return False
+        self.ingest(pairs)
+        self.last_refresh = time.time()
+        self._counts["refreshes"] += 1
+        return True
+
+    def ensure_fresh(self, max_age: float) -> None:
+        """Refresh once if the last pull is older than max_age (cron / cold-start callers)."""
+        if time.time() - self.last_refresh < max_age:
+            return
+        with self._refresh_lock:
+            if time.time() - self.last_refresh >= max_age:
+                self.refresh()
+
+    def symbols(self) -> list[str]:
+        """Base-token symbols currently in the store (the ticker universe we have seen)."""
+        now = time.time()
+        with self._lock:
+            self._drain_offered()
+            self._maybe_compact(now)
+            return [r.symbol for r in self._records.values()]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                **self._counts,
+                "records": len(self._records),
+                "heap_entries": {w: len(self._up[w]) + len(self._down[w]) for w in self.windows},
+                "last_refresh_age": round(time.time() - self.last_refresh, 1) if self.last_refresh else None,
+            }
+
+_cfg = CONFIG["MOVERS"]
+engine = MoversEngine(
+    windows=_cfg["windows"],
+    min_liquidity=_cfg["min_liquidity"],
+    min_volume=_cfg["min_volume"],
+    max_age=_cfg["max_age"],
+)
+
+def top_movers(window: str = "h24", k: int = 5):
+    """Ranked movers, pulling once first if the background refresh has not run lately."""
+    engine.ensure_fresh(_cfg["refresh_every"])
+    return engine.top_movers(window, k)
+
+def stats() -> dict:
+    return engine.stats()
@@ -0,0 +1,92 @@
+# near_dup.py
+"""
+Near-duplicate headline clustering (MinHash + banded LSH).
+
+Titles are normalized to a set of words (lowercase, stopwords and trailing
+outlet tags like "- Reuters" dropped). Each set gets a MinHash signature.
+The signature is cut into bands, and only titles that share a band bucket
+are compared, by exact Jaccard similarity against a cluster's representative.
+Clustering therefore stays roughly linear in the number of items.
+With the defaults (32 hashes, 16 bands of 2) two titles at Jaccard 0.6 meet
+in some bucket with probability about 0.999.
+"""
+import hashlib
+import random
+import re
+
+_WORD = re.compile(r"[a-z0-9]+")
+_OUTLET_TAG = re.compile(r"\s+[-|–—]\s+[^-|–—]{2,40}$")
+
+_STOPWORDS = {
+    "a", "an", "the", "and", "or", "of", "to", "in", "on", "for", "at", "by", "with",
+    "as", "is", "are", "was", "be", "its", "it", "from", "after", "over", "amid", "says",
+}
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(0x5EED)
+_PERMS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(32)]
+
+def shingles(title: str) -> frozenset:
+    title = _OUTLET_TAG.sub("", title or "")
+    return frozenset(w for w in _WORD.findall(title.lower()) if w not in _STOPWORDS)
+
+def _h64(word: str) -> int:
+    return int.from_bytes(hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest(), "big")
+
+def minhash(words: frozenset) -> tuple:
+    if not words:
+        return tuple(0 for _ in _PERMS)
+    hs = [_h64(w) for w in words]
+    return tuple(min((a * h + b) % _PRIME for h in hs) for a, b in _PERMS)
+
+def jaccard(a: frozenset, b: frozenset) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+class Cluster:
+    __slots__ = ("rep", "words", "members", "sources")
+
+    def __init__(self, rep, words: frozenset, source: str):
+        self.rep = rep
+        self.words = words
+        self.members = [rep]
+        self.sources = {source} if source else set()
+
+    @property
+    def source_count(self) -> int:
+        return max(1, len(self.sources))
+
+def cluster(items, title=lambda it: it["title"], source=lambda it: it.get("source", ""),
+            threshold: float = 0.6, band_size: int = 2) -> list[Cluster]:
+    """
+    Group items whose titles are near-duplicates. The first item seen in a
+    cluster is its representative, so pass items best-first. Clusters come
+    back in the order of their representatives.
+    """
+    buckets: dict[tuple, list[Cluster]] = {}
+    clusters: list[Cluster] = []
+
+    for it in items:
+        words = shingles(title(it))
+        sig = minhash(words)
+        keys = [(i, sig[i:i + band_size]) for i in range(0, len(sig), band_size)]
+        found = None
+        for k in keys:
+            for c in buckets.get(k, ()):
+                if jaccard(words, c.words) >= threshold:
+                    found = c
+                    break
+            if found:
+                break
+        if found:
+            found.members.append(it)
+            src = source(it)
+            if src:
+                found.sources.add(src)
+            continue
+        c = Cluster(it, words, source(it))
+        clusters.append(c)
+        for k in keys:
+            buckets.setdefault(k, []).append(c)
+    return clusters
@@ -1,15 +1,19 @@
 # news_monitor.py
 from __future__ import annotations
 
+import concurrent.futures
 import os
-import re
-from datetime import datetime, timezone, timedelta
+import threading
+import time
+from datetime import datetime, timezone
 from typing import List, Dict, Any
+from urllib.parse import urlparse
 
-import feedparser
-from dateutil import parser as dateparser
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-from pytrends.request import TrendReq
+from config import CONFIG
+from feed_cache import FeedCache
+from news_store import NewsStore
+from sentiment_cache import SentimentCache
+from text_matcher import PhraseMatcher
 
 RSS_FEEDS = [
     "https://feeds.a.dj.com/rss/RSSMarketsMain.xml",
@@ -27,11 +31,56 @@ SIGNAL_KEYWORDS = [
     "recession","stimulus","tariff","sanction","outage","halt","delisting",
 ]
 
-_sent = SentimentIntensityAnalyzer()
+# plural forms that should flag as well; matching is exact, nothing else is inferred
+_SIGNAL_PLURALS = {
+    "rate": ("rates",), "hike": ("hikes",), "cut": ("cuts",), "etf": ("etfs",),
+    "approval": ("approvals",), "rejection": ("rejections",), "lawsuit": ("lawsuits",),
+    "hack": ("hacks",), "exploit": ("exploits",), "downgrade": ("downgrades",),
+    "upgrade": ("upgrades",), "merger": ("mergers",), "acquisition": ("acquisitions",),
+    "tariff": ("tariffs",), "sanction": ("sanctions",), "outage": ("outages",),
+    "halt": ("halts",), "delisting": ("delistings",),
+}
+
+_TICKER_ALIASES = [
+    ("BTC", ("bitcoin", "btc")),
+    ("ETH", ("ethereum", "eth")),
+    ("SOL", ("solana", "sol")),
+    ("DOGE", ("dogecoin", "doge")),
+    ("LINK", ("chainlink", "link")),
+    ("XRP", ("xrp", "ripple")),
+    ("ADA", ("cardano", "ada")),
+    ("BNB", ("bnb", "binance coin", "binancecoin")),
+]
+
+# all-caps words in headlines that collide with real token symbols
+_NOT_TICKERS = {"ceo", "cfo", "usa", "usd", "eur", "gdp", "ipo", "imf", "ecb", "boe", "nyse", "nasdaq", "new", "the"}
+
+# signal keywords and ticker tags in one pass; the symbol universe is refreshed from the movers store
+_matcher = PhraseMatcher()
+for _kw in SIGNAL_KEYWORDS:
+    _matcher.add("signal", _kw, _kw, *_SIGNAL_PLURALS.get(_kw, ()))
+for _sym, _aliases in _TICKER_ALIASES:
+    _matcher.add("ticker", _sym, *_aliases)
+_universe_ts = 0.0
+
+# feedparser, dateutil, VADER, pytrends (which drags in pandas), http_client
+# (requests, the rate limiter), near_dup and movers load on first use, so a
+# cron run that only reads the news store never imports them
+_sent = None
+_sent_cache = SentimentCache(CONFIG["NEWS_SENTIMENT_CACHE_SIZE"], CONFIG.get("NEWS_SENTIMENT_CACHE") or None)
+_fetch_cpu = {"calls": 0, "total_ms": 0.0, "last_ms": 0.0}
+
+def _compound(text: str) -> float:
+    global _sent
+    if _sent is None:
+        from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+        _sent = SentimentIntensityAnalyzer()
+    return _sent.polarity_scores(text)["compound"]
 
 def _safe_parse_date(dt_str: str | None):
     if not dt_str:
         return None
+    from dateutil import parser as dateparser
     try:
         return dateparser.parse(dt_str)
     except Exception:
@@ -40,12 +89,88 @@ def _safe_parse_date(dt_str: str | None):
 def _now_utc():
     return datetime.now(timezone.utc)
 
-def fetch_news(max_items: int = 50):
+def _as_utc(dt):
+    if dt is not None and dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt
+
+_RSS_HEADERS = {"Accept": "application/rss+xml, application/atom+xml, application/xml;q=0.9, */*;q=0.8"}
+
+# downloads that miss the deadline keep running here instead of blocking the caller
+_feed_pool = concurrent.futures.ThreadPoolExecutor(max_workers=8, thread_name_prefix="rss")
+
+_feed_cache = FeedCache(CONFIG.get("NEWS_FEED_CACHE") or None)
+
+def _download_feed(url: str) -> bytes | None:
+    """Conditional GET: a 304 answers from the cache, a 200 replaces it."""
+    import http_client
+
+    host = urlparse(url).hostname or url
+    headers = dict(_RSS_HEADERS, **_feed_cache.validators(url))
+    r = http_client.get(url, "rss", upstream=f"rss:{host}", headers=headers)
+    if r.status_code == 304:
+        return _feed_cache.not_modified(url)
+    if not r.ok:
+        return None
+    return _feed_cache.store(url, r.content, r.headers.get("ETag"), r.headers.get("Last-Modified"))
+
+def _download_feeds(urls: List[str], deadline: float) -> List[bool]:
+    """
+    Fetch every feed concurrently into the feed cache. Returns, in `urls`
+    order, whether a body (fresh, 304 or last good copy) is available.
+    """
+    futures = [_feed_pool.submit(_download_feed, u) for u in urls]
+    concurrent.futures.wait(futures, timeout=deadline)
+    ready = []
+    for url, fut in zip(urls, futures):
+        if not fut.done():
+            print(f"RSS feed missed the {deadline:g}s deadline: {url}")
+        elif fut.exception() is not None:
+            print(f"RSS feed error ({url}):", fut.exception())
+        elif fut.result() is not None:
+            ready.append(True)
+            continue
+        ready.append(_feed_cache.last_good(url) is not None)
+    _feed_cache.save()
+    return ready
+
+def news_stats() -> dict:
+    """Feed cache, sentiment cache and CPU-per-fetch_news counters."""
+    calls = _fetch_cpu["calls"]
+    return {
+        "feeds": _feed_cache.stats(),
+        "sentiment": _sent_cache.stats(),
+        "store": _news_store.stats(),
+        "fetch_cpu_ms": {
+            "calls": calls,
+            "last": round(_fetch_cpu["last_ms"], 1),
+            "avg": round(_fetch_cpu["total_ms"] / calls, 1) if calls else None,
+        },
+    }
+
+def fetch_news(max_items: int | None = 50):
+    t0 = time.process_time()
+    try:
+        return _fetch_news(max_items)
+    finally:
+        ms = (time.process_time() - t0) * 1000
+        _fetch_cpu["calls"] += 1
+        _fetch_cpu["total_ms"] += ms
+        _fetch_cpu["last_ms"] = ms
+        _sent_cache.save()
+
+def _fetch_news(max_items: int | None):
+    import feedparser
+
     items = []
     seen_links = set()
-    for url in RSS_FEEDS:
+    ready = _download_feeds(RSS_FEEDS, CONFIG["NEWS_FETCH_DEADLINE"])
+    for url, ok in zip(RSS_FEEDS, ready):
+        if not ok:
+            continue
         try:
-            feed = feedparser.parse(url)
+            # parsed once per distinct body; unchanged (304) feeds reuse it
+            feed = _feed_cache.parsed(url, feedparser.parse)
         except Exception:
             continue
         for e in feed.get("entries", []):
@@ -63,10 +188,10 @@ def fetch_news(max_items: int = 50):
 
             text_for_sent = f"{title}. {summary}"
             try:
-                sentiment = _sent.polarity_scores(text_for_sent)["compound"]
+                sentiment = _sent_cache.score(link, title, summary, _compound)
             except Exception:
                 sentiment = 0.0
-            flagged = any(k in text_for_sent.lower() for k in SIGNAL_KEYWORDS)
+            flagged = bool(_matcher.match(text_for_sent).get("signal"))
 
             items.append({
                 "title": title,
@@ -77,19 +202,140 @@ def fetch_news(max_items: int = 50):
                 "sentiment": sentiment,
                 "flagged": flagged,
             })
-            if len(items) >= max_items:
-                return items
+
+    # every feed gets read before the cap, which keeps the newest items across all of them
+    if max_items is not None and len(items) > max_items:
+        oldest = datetime.min.replace(tzinfo=timezone.utc)
+        newest_first = sorted(items, key=lambda it: _as_utc(it["published_dt"]) or oldest, reverse=True)
+        keep = {id(it) for it in newest_first[:max_items]}
+        items = [it for it in items if id(it) in keep]
     return items
 
-def fetch_trends(keywords: List[str], timeframe: str = "now 7-d") -> Dict[str, int]:
-    proxy = os.getenv("PYTRENDS_PROXY")
-    pytrends = TrendReq(hl="en-US", tz=0, proxies=[proxy] if proxy else None)
-    pytrends.build_payload(keywords, timeframe=timeframe)
+_news_store = NewsStore(CONFIG["NEWS_DB"], keep_days=CONFIG["NEWS_KEEP_DAYS"])
+
+_ingest_lock = threading.Lock()
+
+def ingest_news() -> int:
+    """Crawl every feed and append new headlines to the news store. Returns items added."""
+    with _ingest_lock:
+        return _news_store.append(fetch_news(max_items=None))
+
+def news_snapshot() -> Dict[str, Any]:
+    """Version and age of the stored news; the version moves only when new headlines land."""
+    info = _news_store.snapshot_info()
+    ts = info["ingested_ts"]
+    return {"version": info["version"], "age_s": round(time.time() - ts) if ts else None}
+
+def refresh_news_if_stale(max_age: float | None = None) -> bool:
+    """
+    Ingest once if the store is older than max_age (cron entry points with no
+    ingest job). A cron service with its own disk never sees the worker's
+    ingests, so there this crawls on every run.
+    """
+    max_age = CONFIG["NEWS_INGEST_EVERY"] if max_age is None else max_age
+    age = news_snapshot()["age_s"]
+    if age is not None and age < max_age:
+        return False
+    ingest_news()
+    return True
+
+# ---------- Google Trends ----------
+
+_TRENDS_BATCH = 5  # Google compares at most five keywords per payload
+
+class TrendsResult(dict):
+    """{keyword: interest}; stale_age is set (seconds) when served from cache after a failure."""
+    stale_age: float | None = None
+
+_trends_req = None
+_trends_lock = threading.Lock()          # cache + backoff; never held across the network
+_trends_fetch_lock = threading.Lock()    # one pytrends request at a time (shared session)
+_trends_cache: Dict[tuple, tuple] = {}   # (keywords, timeframe, geo) -> (values, fetched_ts)
+_trends_backoff_until = 0.0
+
+def _trends_ttl(timeframe: str) -> float:
+    # roughly one data point: minute data for hour windows, 8-min for a day, hourly for a week
+    tf = (timeframe or "").lower()
+    if tf.startswith("now") and tf.endswith("-h"):
+        return 300
+    if tf == "now 1-d":
+        return 900
+    if tf == "now 7-d":
+        return 3600
+    return 6 * 3600
+
+def _trends_session():
+    global _trends_req
+    if _trends_req is None:
+        from pytrends.request import TrendReq
+        proxy = os.getenv("PYTRENDS_PROXY")
+        _trends_req = TrendReq(hl="en-US", tz=0, proxies=[proxy] if proxy else None)
+    return _trends_req
+
+def _fetch_trends_batch(keywords: tuple, timeframe: str, geo: str) -> Dict[str, int]:
+    pytrends = _trends_session()
+    pytrends.build_payload(list(keywords), timeframe=timeframe, geo=geo)
     data = pytrends.interest_over_time()
     if data.empty:
         return {}
     return {kw: int(data[kw].iloc[-1]) for kw in keywords}
 
+def fetch_trends(keywords: List[str], timeframe: str = "now 7-d", geo: str = "") -> Dict[str, int]:
+    """
+    Latest Google Trends interest per keyword, cached per (keywords, timeframe,
+    geo) for about one data point. Keywords go five to a payload; values are
+    only comparable within one payload. On errors (mostly 429s) the last good
+    value is served with `stale_age` set, and Google is left alone for
+    TRENDS_BACKOFF seconds. Blocking; call it from a worker thread.
+    """
+    global _trends_backoff_until
+    out = TrendsResult()
+    ttl = _trends_ttl(timeframe)
+    batches = [tuple(keywords[i:i + _TRENDS_BATCH]) for i in range(0, len(keywords), _TRENDS_BATCH)]
+    for batch in batches:
+        key = (batch, timeframe, geo)
+        with _trends_lock:
+            cached = _trends_cache.get(key)
+            if cached and time.time() - cached[1] < ttl:
+                out.update(cached[0])
+                continue
+        values, err = None, None
+        with _trends_fetch_lock:
+            # someone may have filled it, or tripped the backoff, while we waited
+            with _trends_lock:
+                cached = _trends_cache.get(key)
+                fresh = cached and time.time() - cached[1] < ttl
+                backing_off = time.time() < _trends_backoff_until
+            if fresh:
+                values = cached[0]
+            elif not backing_off:
+                try:
+                    fetched = _fetch_trends_batch(batch, timeframe, geo)
+                    with _trends_lock:
+                        _trends_cache[key] = (fetched, time.time())
+                    values = fetched
+                except Exception as e:
+                    err = e
+                    with _trends_lock:
+                        _trends_backoff_until = time.time() + CONFIG["TRENDS_BACKOFF"]
+        if values is not None:
+            out.update(values)
+            continue
+        if err is not None:
+            print("fetch_trends error:", err)
+        if cached:
+            out.update(cached[0])
+            age = time.time() - cached[1]
+            out.stale_age = max(out.stale_age or 0, age)
+    return out
+
+def _trends_line(trends: Dict[str, int], label: str) -> str:
+    kv = " · ".join([f"{k}: {v}" for k, v in trends.items()])
+    age = getattr(trends, "stale_age", None)
+    if age:
+        kv += f" _(as of {int(age // 3600)}h{int(age % 3600 // 60):02d}m ago)_"
+    return f"🔎 **{label}** — {kv}"
+
 def _sentiment_badge(s: float) -> str:
     if s >= 0.35:
         return "🟢"
@@ -103,36 +349,21 @@ def summarize_market_news(
     prefer_flagged: bool = True,
     max_headlines: int = 8
 ) -> Dict[str, Any]:
-    raw = fetch_news(max_items=200)
-    cutoff = _now_utc() - timedelta(hours=hours_back)
-
-    considered: List[Dict[str, Any]] = []
-    for it in raw:
-        dt = it.get("published_dt")
-        if dt and dt.tzinfo is None:
-            dt = dt.replace(tzinfo=timezone.utc)
-        if not dt or dt < cutoff:
-            continue
-        if abs(it.get("sentiment", 0.0)) >= min_abs_sentiment or it.get("flagged", False):
-            considered.append(it)
-
-    if prefer_flagged:
-        considered.sort(
-            key=lambda x: (
-                not x.get("flagged", False),
-                -abs(x.get("sentiment", 0.0)),
-                (_now_utc() - (x.get("published_dt") or cutoff)).total_seconds()
-            )
-        )
-    else:
-        considered.sort(
-            key=lambda x: (
-                -abs(x.get("sentiment", 0.0)),
-                (_now_utc() - (x.get("published_dt") or cutoff)).total_seconds()
-            )
-        )
-
-    selected = considered[:max_headlines]
+    # reads the store only; feeds are crawled by the ingester (ingest_news)
+    candidates, counts = _news_store.window(hours_back, min_abs_sentiment, prefer_flagged,
+                                            max(50, max_headlines * 5))
+
+    # one slot per story: syndicated copies collapse into their best-ranked
+    # version, and every extra outlet carrying it adds a little salience
+    import near_dup
+
+    clusters = near_dup.cluster(candidates)
+    def rank(c):
+        boost = abs(c.rep.get("sentiment", 0.0)) + 0.1 * (c.source_count - 1)
+        return (not c.rep.get("flagged", False), -boost) if prefer_flagged else (-boost,)
+    clusters.sort(key=rank)
+    selected = [dict(c.rep, sources=c.source_count) for c in clusters[:max_headlines]]
+    counts = dict(counts, stories=len(clusters))
 
     pos = sum(1 for i in selected if i.get("sentiment", 0) > 0.15)
     neg = sum(1 for i in selected if i.get("sentiment", 0) < -0.15)
@@ -157,12 +388,14 @@ def summarize_market_news(
             "sentiment": i.get("sentiment", 0.0),
             "flagged": i.get("flagged", False),
             "badge": _sentiment_badge(i.get("sentiment", 0.0)),
+            "sources": i.get("sources", 1),
         })
 
     return {
         "summary": summary,
         "items": out_items,
-        "counts": {"total": len(raw), "considered": len(considered), "selected": len(out_items)}
+        "counts": dict(counts, selected=len(out_items)),
+        "snapshot": news_snapshot(),
     }
 
 def format_markdown_report(
@@ -172,8 +405,7 @@ def format_markdown_report(
 ) -> str:
     lines = [f"**{title}**", summary_data.get("summary", "")]
     if trends:
-        kv = " · ".join([f"{k}: {v}" for k, v in trends.items()])
-        lines.append(f"🔎 **Search Interest (Google Trends)** — {kv}")
+        lines.append(_trends_line(trends, "Search Interest (Google Trends)"))
 
     items = summary_data.get("items", [])
     if items:
@@ -186,47 +418,30 @@ def format_markdown_report(
 
     counts = summary_data.get("counts", {})
     lines.append("")
-    lines.append(f"_Selected {counts.get('selected', 0)} of {counts.get('considered', 0)} considered ({counts.get('total', 0)} total fetched)._")
+    lines.append(f"_Selected {counts.get('selected', 0)} of {counts.get('considered', 0)} considered ({counts.get('total', 0)} in window)._")
     return "\n".join(lines)
 
-_TICKER_PATTERNS = [
-    ("BTC", r"\b(bitcoin|btc)\b"),
-    ("ETH", r"\b(ethereum|eth)\b"),
-    ("SOL", r"\b(solana|sol)\b"),
-    ("DOGE", r"\b(dogecoin|doge)\b"),
-    ("LINK", r"\b(chainlink|link)\b"),
-    ("XRP", r"\b(xrp|ripple)\b"),
-    ("ADA", r"\b(cardano|ada)\b"),
-    ("BNB", r"\b(bnb|binance\s*coin)\b"),
-]
-
 def _truncate(s: str, max_len: int) -> str:
+    s = s or ""
     return s if len(s) <= max_len else s[: max_len - 1].rstrip() + "…"
 
+def _refresh_ticker_universe(max_age: float = 300) -> None:
+    global _universe_ts
+    if time.time() - _universe_ts < max_age:
+        return
+    _universe_ts = time.time()
+    import movers  # deferred: pulls in the market-data stack the news cron otherwise skips
+    _matcher.set_symbols(movers.engine.symbols(), exclude=set(SIGNAL_KEYWORDS) | _NOT_TICKERS)
+
 def _tags_for_title(title: str) -> list[str]:
-    t = title.lower()
-    tags: list[str] = []
-    for sym, pat in _TICKER_PATTERNS:
-        if re.search(pat, t):
-            tags.append(sym)
-    return tags
+    _refresh_ticker_universe()
+    return _matcher.match(title).get("ticker", [])
 
 def format_compact_report(summary_data, trends=None, title="Market Movers",
                           max_items=6, max_title_len=90, show_times=False, include_footer=False):
-    def _truncate(s, n): 
-        s = s or ""
-        return s if len(s) <= n else s[:n-1].rstrip() + "…"
-    def _tags_for_title(title):
-        t = (title or "").lower()
-        tags=[]
-        for sym, pat in _TICKER_PATTERNS:
-            if re.search(pat, t): tags.append(sym)
-        return tags
-
     lines = [f"**{title}**", summary_data.get("summary","")]
     if trends:
-        kv = " · ".join([f"{k}: {v}" for k,v in trends.items()])
-        lines.append(f"🔎 **Trends** — {kv}")
+        lines.append(_trends_line(trends, "Trends"))
 
     items = summary_data.get("items", [])[:max_items]
     for it in items:
@@ -236,13 +451,15 @@ def format_compact_report(summary_data, trends=None, title="Market Movers",
         tags = _tags_for_title(short)
         tags_part = (" " + " ".join(f"`{t}`" for t in tags)) if tags else ""
         src = f" — {it.get('source','')}" if it.get('source') else ""
+        if it.get("sources", 1) > 1:
+            src += f" (+{it['sources'] - 1} more)"
         ts = f" · {it.get('published','')[:16].replace('T',' ')}" if (show_times and it.get('published')) else ""
         url = it.get("link","")
         lines.append(f"{it.get('badge','')}{tags_part} [{short}]({url}){src}{ts}")
 
     if include_footer:
         c = summary_data.get("counts", {})
-        lines += ["", f"_Selected {c.get('selected',0)} of {c.get('considered',0)} considered ({c.get('total',0)} total fetched)._"]
+        lines += ["", f"_Selected {c.get('selected',0)} of {c.get('considered',0)} considered ({c.get('total',0)} in window)._"]
 
     out = "\n".join([ln for ln in lines if ln is not None])
     return out or "**Market Movers**\nNo qualifying headlines right now."
\ No newline at end of file
@@ -0,0 +1,117 @@
+# news_store.py
+"""
+Local store of ingested news items (SQLite, WAL mode).
+
+One row per headline link (dedupe on insert), with indexes on published
+time, on (flagged, published time) and on |sentiment|, so the summarizer's
+"last N hours, strong or flagged, best first" query is an index range scan
+instead of a re-crawl. Rows past `keep_days` are pruned on ingest.
+
+Every ingest stamps the store; one that adds rows also bumps its version.
+Both live in the database, so readers in other processes (web, cron) see
+the same snapshot version and age as the ingesting process.
+"""
+import sqlite3
+import threading
+import time
+from datetime import timezone
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS news (
+    link         TEXT PRIMARY KEY,
+    title        TEXT NOT NULL,
+    source       TEXT,
+    published    TEXT,
+    published_ts REAL,
+    sentiment    REAL NOT NULL DEFAULT 0,
+    flagged      INTEGER NOT NULL DEFAULT 0,
+    ingested_ts  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS news_published ON news (published_ts);
+CREATE INDEX IF NOT EXISTS news_flagged_published ON news (flagged, published_ts);
+CREATE INDEX IF NOT EXISTS news_abs_sentiment ON news (abs(sentiment));
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value REAL NOT NULL
+);
+"""
+
+_ITEM_COLUMNS = ("title", "link", "source", "published", "published_ts", "sentiment", "flagged")
+
+def _epoch(dt) -> float | None:
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+class NewsStore:
+    def __init__(self, path: str, keep_days: float = 14):
+        self.path = path
+        self.keep_days = keep_days
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def append(self, items) -> int:
+        """Insert fetch_news items; links already stored are skipped. Returns rows added."""
+        now = time.time()
+        rows = [
+            (it["link"], it["title"], it.get("source", ""), it.get("published"),
+             _epoch(it.get("published_dt")), it.get("sentiment", 0.0), int(bool(it.get("flagged"))), now)
+            for it in items
+        ]
+        conn = self._conn()
+        with self._write_lock, conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO news "
+                "(link, title, source, published, published_ts, sentiment, flagged, ingested_ts) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            added = conn.total_changes - before
+            conn.execute("DELETE FROM news WHERE COALESCE(published_ts, ingested_ts) < ?",
+                         (now - self.keep_days * 86400,))
+            if added:
+                conn.execute("INSERT INTO meta (key, value) VALUES ('version', 1) "
+                             "ON CONFLICT (key) DO UPDATE SET value = value + 1")
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('ingested_ts', ?)", (now,))
+        return added
+
+    def snapshot_info(self) -> dict:
+        """{"version": bumps when an ingest adds items, "ingested_ts": last ingest (0 if never)}."""
+        meta = dict(self._conn().execute("SELECT key, value FROM meta").fetchall())
+        return {"version": int(meta.get("version", 0)), "ingested_ts": meta.get("ingested_ts", 0.0)}
+
+    def window(self, hours_back: float, min_abs_sentiment: float, prefer_flagged: bool = True,
+               limit: int = 8) -> tuple[list[dict], dict]:
+        """
+        Items published in the last `hours_back` hours that are flagged or
+        have |sentiment| >= min_abs_sentiment, best first. Returns
+        (items, {"total": in window, "considered": matching}).
+        """
+        cutoff = time.time() - hours_back * 3600
+        order = ("flagged DESC, abs(sentiment) DESC, published_ts DESC" if prefer_flagged
+                 else "abs(sentiment) DESC, published_ts DESC")
+        conn = self._conn()
+        rows = conn.execute(
+            f"SELECT {', '.join(_ITEM_COLUMNS)} FROM news "
+            "WHERE published_ts >= ? AND (flagged = 1 OR abs(sentiment) >= ?) "
+            f"ORDER BY {order} LIMIT ?", (cutoff, min_abs_sentiment, limit)).fetchall()
+        total, considered = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(flagged = 1 OR abs(sentiment) >= ?), 0) "
+            "FROM news WHERE published_ts >= ?", (min_abs_sentiment, cutoff)).fetchone()
+        items = [dict(zip(_ITEM_COLUMNS, r), flagged=bool(r[-1])) for r in rows]
+        return items, {"total": total, "considered": considered}
+
+    def stats(self) -> dict:
+        n, newest = self._conn().execute("SELECT COUNT(*), MAX(published_ts) FROM news").fetchone()
+        return {"items": n, "newest_age_s": round(time.time() - newest) if newest else None}
@@ -1,108 +1,69 @@
 # price_fetcher.py
+import asyncio
+import contextvars
+import dataclasses
 import os
+import threading
 import time
-import requests
+from concurrent.futures import ThreadPoolExecutor
+import http_client
+import movers
+import snapshot_store
 from config import CONFIG
-from chain_fallback import fallback_fetch
+from token_cache import TokenCache, STALE, MISS
+from singleflight import SingleFlight
+from chain_fallback import fallback_fetch_async
+from token_snapshot import LpStatus, TokenSnapshot, address_key, to_num, to_int
+from risk import RISK_BADGES, risk_level
 from content import pick_wisdom
 
 COINGLASS_API_KEY = os.getenv("COINGLASS_API_KEY")
 
-# ---------- small formatters ----------
-
-def _fmt_money(x):
-    try:
-        f = float(str(x).replace("$","").replace(",","").strip())
-        return f"${f:,.0f}" if abs(f) >= 1000 else f"${f:,.2f}"
-    except Exception:
-        return str(x)
-
-def _lp_icon(locked):
-    if locked is True:  return "🔥"
-    if locked is False: return "💦"
-    return "💀"
-
 # ---------- Dexscreener helpers ----------
 
-def _dex_tokens(contract: str):
+async def _dex_tokens_async(contract: str):
     url = f"{CONFIG['DEXSCREENER_API']}/tokens/{contract}"
-    r = requests.get(url, headers=CONFIG.get("DEFAULT_HEADERS", {}), timeout=20)
-    return (r.json() or {}).get("pairs", []) if r.ok else None
+    data = await http_client.aget_json(url, "dexscreener", upstream="dexscreener:tokens")
+    if data is None:
+        return None
+    pairs = data.get("pairs", [])
+    # lookups see live pairs too; let the movers store pick them up for free
+    movers.engine.offer(pairs)
+    return pairs
 
-def _dex_search(query: str):
+async def _dex_search_async(query: str):
     url = f"{CONFIG['DEXSCREENER_API']}/search/?q={query}"
-    r = requests.get(url, headers=CONFIG.get("DEFAULT_HEADERS", {}), timeout=20)
-    return (r.json() or {}).get("pairs", []) if r.ok else None
+    data = await http_client.aget_json(url, "dexscreener", upstream="dexscreener:search")
+    return data.get("pairs", []) if data is not None else None
 
 # ---------- risk badge ----------
 
-def _to_float(x):
-    try:
-        if x is None: return 0.0
-        if isinstance(x, (int, float)): return float(x)
-        return float(str(x).replace("$","").replace(",","").strip())
-    except Exception:
-        return 0.0
-
-def risk_badge_from_data(data: dict) -> str:
-    liq = _to_float(data.get("liquidity"))
-    vol = _to_float(data.get("volume"))
-    fdv = _to_float(data.get("fdv"))
-    lp_locked = (data.get("lp_burned") == "🔥")
-    ratio = (fdv / liq) if liq > 0 else float("inf")
-
-    if liq >= 500_000 and vol >= 300_000 and ratio < 50:
-        level = "low"
-    elif liq >= 100_000 and vol >= 50_000:
-        level = "medium"
+def risk_badge_from_data(data) -> str:
+    """Risk badge for a TokenSnapshot (or a legacy report dict)."""
+    if isinstance(data, TokenSnapshot):
+        level = risk_level(data.liquidity or 0.0, data.volume_24h or 0.0, data.fdv or 0.0,
+                           data.lp is LpStatus.LOCKED)
     else:
-        level = "high"
-
-    if lp_locked and level == "high":
-        level = "medium"
-    elif lp_locked and level == "medium" and liq >= 400_000 and vol >= 200_000 and ratio < 60:
-        level = "low"
-
-    return {"low":"🔹 Low","medium":"🔷 Medium"}.get(level,"🔷🔷 High")
+        level = risk_level(to_num(data.get("liquidity")) or 0.0, to_num(data.get("volume")) or 0.0,
+                           to_num(data.get("fdv")) or 0.0, data.get("lp_burned") == LpStatus.LOCKED.value)
+    return RISK_BADGES[level]
 
 # ---------- Solana enrichment ----------
 
-def _fmt_age_from_unix(ts):
-    if not ts: return None
-    try:
-        ts = float(ts)
-        if ts > 10**12: ts = ts/1000.0
-        delta = max(0, int(time.time()-ts))
-        years, rem = divmod(delta, 365*86400)
-        months, rem = divmod(rem, 30*86400)
-        weeks, rem = divmod(rem, 7*86400)
-        days, _ = divmod(rem, 86400)
-        parts=[]
-        if years: parts.append(f"{years}y")
-        if months: parts.append(f"{months}mo")
-        if weeks: parts.append(f"{weeks}w")
-        if days and not parts: parts.append(f"{days}d")
-        return " ".join(parts) or "0d"
-    except Exception:
-        return None
-
-def _solscan_meta_raw(mint: str):
+async def _solscan_meta_raw_async(mint: str):
     try:
-        r = requests.get(
-            f"https://public-api.solscan.io/token/meta?tokenAddress={mint}",
-            headers={"accept":"application/json"}, timeout=20
-        )
-        return r.json() if r.ok else {}
+        return await http_client.aget_json(
+            f"https://public-api.solscan.io/token/meta?tokenAddress={mint}", "solscan"
+        ) or {}
     except Exception:
         return {}
 
-def _solscan_holders_top(mint: str, limit=1):
+async def _solscan_holders_top_async(mint: str, limit=1):
     try:
-        r = requests.get(
+        return await http_client.aget_json(
             f"https://public-api.solscan.io/token/holders?tokenAddress={mint}&offset=0&limit={limit}",
-            headers={"accept":"application/json"}, timeout=20
-        )
-        return r.json() if r.ok else {}
+            "solscan"
+        ) or {}
     except Exception:
         return {}
 
@@ -126,21 +87,46 @@ def _extract_links_from_info(info: dict | None) -> dict:
         return ""
     return {"web": pick_site(), "x": pick_social("x"), "tg": pick_social("telegram")}
 
-def _enrich_solana(contract: str, base_out: dict) -> dict:
+# enrichment fields fed by each Solscan call (top holder % needs both)
+_META_ONLY_FIELDS = ("holders", "mint_auth", "freeze_auth", "created_ts")
+
+async def _enrich_solana_async(contract: str, snap: TokenSnapshot, deadline: float | None = None) -> TokenSnapshot:
+    """
+    Solscan meta + top holder, fetched concurrently under one deadline.
+    Whatever lands in time is filled in; the rest is listed in snap.pending.
+    """
+    if deadline is None:
+        deadline = CONFIG.get("SOLANA_ENRICH_DEADLINE", 3.0)
+    # calls still hanging at the deadline count against Solscan's breaker
+    with http_client.deadline(deadline):
+        meta_t = asyncio.ensure_future(_solscan_meta_raw_async(contract))
+        hold_t = asyncio.ensure_future(_solscan_holders_top_async(contract, limit=1))
+    done, late = await asyncio.wait({meta_t, hold_t}, timeout=deadline)
+    for t in late:
+        t.cancel()
+
+    pending = []
+    if meta_t not in done:
+        pending += list(_META_ONLY_FIELDS)
+    if meta_t not in done or hold_t not in done:
+        pending.append("top_holder_pct")
+    snap.pending = tuple(pending)
+
     try:
-        meta = _solscan_meta_raw(contract) or {}
-        holders = meta.get("holder")
-        if holders is not None and not base_out.get("holders"):
-            base_out["holders"] = str(holders)
-        base_out["mint_auth"]   = bool(meta.get("mintAuthority"))
-        base_out["freeze_auth"] = bool(meta.get("freezeAuthority"))
-        created = meta.get("createdTime") or meta.get("createTime") or meta.get("updateUnixTime")
-        age_str = _fmt_age_from_unix(created)
-        if age_str: base_out["age"] = age_str
+        meta = (meta_t.result() if meta_t in done else None) or {}
+        if meta_t in done:
+            holders = to_int(meta.get("holder"))
+            if holders is not None and snap.holders is None:
+                snap.holders = holders
+            snap.mint_auth   = bool(meta.get("mintAuthority"))
+            snap.freeze_auth = bool(meta.get("freezeAuthority"))
+            created = to_num(meta.get("createdTime") or meta.get("createTime") or meta.get("updateUnixTime"))
+            if created:
+                snap.created_ts = created / 1000.0 if created > 10**12 else created
 
         supply = meta.get("supply") or meta.get("tokenSupply")
         decimals = meta.get("decimals")
-        raw_h = _solscan_holders_top(contract, limit=1) or {}
+        raw_h = (hold_t.result() if hold_t in done else None) or {}
         arr = raw_h.get("data") or raw_h.get("result") or raw_h.get("holders") or []
         if arr:
             item = arr[0]
@@ -156,125 +142,285 @@ def _enrich_solana(contract: str, base_out: dict) -> dict:
                     if isinstance(decimals,int) and decimals>0 and total>10**6:
                         total = total/(10**decimals)
                     pct = (top_amount/total)*100 if total>0 else 0.0
-                    base_out["top_holder_pct"] = round(pct,2)
+                    snap.top_holder_pct = round(pct,2)
                 except Exception:
                     pass
     except Exception:
         pass
-    return base_out
+    return snap
+
+# ---------- chain resolution ----------
+
+_BASE58 = set("123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz")
+
+def _pair_liq(p: dict) -> float:
+    return (p.get("liquidity") or {}).get("usd") or 0
+
+def _best_pair(pairs: list, chain: str | None = None) -> dict | None:
+    """Highest-liquidity pair on `chain` (any chain when None); None if that chain has none."""
+    if chain:
+        pairs = [p for p in pairs if p.get("chainId") == chain]
+    return max(pairs, key=_pair_liq) if pairs else None
+
+def _best_chain(pairs: list) -> str | None:
+    """Group pairs by chainId and pick the chain holding the most liquidity."""
+    totals = {}
+    for p in pairs:
+        ch = p.get("chainId")
+        if ch:
+            totals[ch] = totals.get(ch, 0) + _pair_liq(p)
+    return max(totals, key=totals.get) if totals else None
+
+def _plausible_chains(contract: str) -> list[str]:
+    """Chains whose address format matches `contract` (used to scope fallbacks)."""
+    c = (contract or "").strip()
+    if "::" in c or (c.startswith("0x") and len(c) == 66):
+        return ["sui"]
+    if c.startswith("0x") and len(c) == 42:
+        return ["base", "ethereum"]
+    if 32 <= len(c) <= 44 and set(c) <= _BASE58:
+        return ["solana"]
+    return []
 
 # ---------- public helpers ----------
 
-def detect_best_chain(contract: str) -> str | None:
+async def detect_best_chain_async(contract: str) -> str | None:
     try:
-        pairs = _dex_tokens(contract) or _dex_search(contract) or []
-        if not pairs: return None
-        best = max(pairs, key=lambda x: ((x.get("liquidity") or {}).get("usd") or 0))
-        return best.get("chainId")
+        pairs = await _dex_tokens_async(contract) or await _dex_search_async(contract) or []
+        return _best_chain(pairs)
     except Exception:
         return None
 
-def parse_data(src: dict, chain: str, contract: str, fallback: bool = False):
+def detect_best_chain(contract: str) -> str | None:
+    return http_client.run_sync(detect_best_chain_async(contract))
+
+def parse_data(src: dict, chain: str, contract: str, fallback: bool = False) -> TokenSnapshot:
+    """Shape a Dexscreener pair (or fallback dict) into a TokenSnapshot. Pure: no I/O."""
     if fallback:
-        return {
-            "name": src.get("name","Unknown"),
-            "price": str(src.get("price","0")),
-            "volume": str(src.get("volume","0")),
-            "liquidity": str(src.get("liquidity","0")),
-            "fdv": str(src.get("fdv","0")),
-            "holders": str(src.get("holders","N/A")),
-            "lp_burned": src.get("lp_burned","💀"),
-            "dex_link": src.get("dex_link",""),
-            "links": src.get("links", {}),
-            "whiz_note": src.get("whiz_note",""),
-        }
+        links = src.get("links") or {}
+        return TokenSnapshot(
+            chain=chain,
+            contract=contract,
+            name=src.get("name") or "Unknown",
+            price=to_num(src.get("price", 0)),
+            volume_24h=to_num(src.get("volume", 0)),
+            liquidity=to_num(src.get("liquidity", 0)),
+            fdv=to_num(src.get("fdv", 0)),
+            holders=to_int(src.get("holders")),
+            lp=LpStatus.from_icon(src.get("lp_burned")),
+            dex_link=src.get("dex_link", ""),
+            link_web=links.get("web", ""),
+            link_x=links.get("x", ""),
+            link_tg=links.get("tg", ""),
+            whiz_note=src.get("whiz_note", ""),
+        )
 
     base = src.get("baseToken") or {}
-    price = src.get("priceUsd")
-    volume_h24 = (src.get("volume") or {}).get("h24")
-    volume_h1  = (src.get("volume") or {}).get("h1")
-    liq_usd = (src.get("liquidity") or {}).get("usd")
-    locked  = (src.get("liquidity") or {}).get("locked")
-    fdv = src.get("fdv")
+    volume = src.get("volume") or {}
+    liquidity = src.get("liquidity") or {}
     links = _extract_links_from_info(src.get("info"))
+    return TokenSnapshot(
+        chain=chain,
+        contract=contract,
+        name=base.get("symbol") or base.get("name") or "Unknown",
+        price=to_num(src.get("priceUsd")),
+        volume_24h=to_num(volume.get("h24")),
+        volume_1h=to_num(volume.get("h1")),
+        liquidity=to_num(liquidity.get("usd")),
+        fdv=to_num(src.get("fdv")),
+        lp=LpStatus.from_locked(liquidity.get("locked")),
+        dex_link=f"https://dexscreener.com/{chain}/{contract}",
+        link_web=links["web"],
+        link_x=links["x"],
+        link_tg=links["tg"],
+    )
 
-    out = {
-        "name": base.get("symbol") or base.get("name") or "Unknown",
-        "price": str(price) if price is not None else "Unknown",
-        "volume": str(volume_h24) if volume_h24 is not None else "Unknown",
-        "volume1h": (str(volume_h1) if volume_h1 is not None else "N/A"),
-        "liquidity": str(liq_usd) if liq_usd is not None else "Unknown",
-        "fdv": str(fdv) if fdv is not None else "Unknown",
-        "holders": "N/A",
-        "lp_burned": _lp_icon(bool(locked) if locked is not None else None),
-        "dex_link": f"https://dexscreener.com/{chain}/{contract}",
-        "links": links,
-        "whiz_note": "",
-    }
-
-    if chain == "solana":
-        out = _enrich_solana(contract, out)
-
-    # Pretty print numeric fields
-    for k in ("price","volume","volume1h","liquidity","fdv"):
-        if out[k] not in ("Unknown","N/A"):
-            out[k] = _fmt_money(out[k])
+# ---------- token lookups (cached) ----------
 
-    return out
+_token_cache = TokenCache(**CONFIG.get("TOKEN_CACHE", {}))
+_bg_refreshes: dict = {}  # key -> asyncio.Task (tasks may live on different loops)
+_bg_lock = threading.Lock()
+_inflight = SingleFlight()  # one upstream chain per (chain, contract), however many pastes
 
-def fetch_token_data(chain: str, contract: str):
+async def _solana_meta(key, contract: str, out: TokenSnapshot) -> bool:
+    """Fill Solana enrichment, reusing cached meta while it is fresh. True if re-fetched."""
+    cached = _token_cache.meta_for(key)
+    if cached is not None:
+        out.apply_meta(cached)
+        return False
+    await _enrich_solana_async(contract, out)
+    return True
+
+async def _lookup_token(key, chain: str, contract: str):
+    out = None
     try:
-        pairs = _dex_tokens(contract) or []
-        if pairs:
-            on_chain = [p for p in pairs if p.get("chainId")==chain]
-            best = (max(on_chain, key=lambda x: ((x.get("liquidity") or {}).get("usd") or 0))
-                    if on_chain else max(pairs, key=lambda x: ((x.get("liquidity") or {}).get("usd") or 0)))
-            return parse_data(best, chain, contract, fallback=False)
+        best = _best_pair(await _dex_tokens_async(contract) or [], chain)
+        if best:
+            out = parse_data(best, chain, contract, fallback=False)
     except Exception as e:
         print("Dexscreener /tokens error:", e)
 
+    if out is None:
+        try:
+            best = _best_pair(await _dex_search_async(contract) or [], chain)
+            if best:
+                out = parse_data(best, chain, contract, fallback=False)
+        except Exception as e:
+            print("Dexscreener /search error:", e)
+
+    if out is not None:
+        fetched = await _solana_meta(key, contract, out) if chain == "solana" else True
+        return out, fetched
+
+    print(f"Dexscreener failed. Falling back to chain API for {chain}:{contract}")
+    fb = await fallback_fetch_async(chain, contract)
+    return (parse_data(fb, chain, contract, fallback=True) if fb else None), True
+
+async def _lookup_token_any(key, contract: str):
+    pairs = []
+    try:
+        pairs = await _dex_tokens_async(contract) or []
+    except Exception as e:
+        print("Dexscreener /tokens error:", e)
+    if not pairs:
+        try:
+            pairs = await _dex_search_async(contract) or []
+        except Exception as e:
+            print("Dexscreener /search error:", e)
+
+    chain = _best_chain(pairs)
+    if chain:
+        out = parse_data(_best_pair(pairs, chain), chain, contract, fallback=False)
+        fetched = await _solana_meta(key, contract, out) if chain == "solana" else True
+        return out, fetched
+
+    # explorers answer for any well-formed address; an "Unknown" name means the
+    # contract is not on that chain, so try the next one before settling for it
+    unknown = None
+    for chain in _plausible_chains(contract):
+        print(f"Dexscreener failed. Falling back to chain API for {chain}:{contract}")
+        fb = await fallback_fetch_async(chain, contract)
+        if fb and (fb.get("name") or "Unknown") != "Unknown":
+            return parse_data(fb, chain, contract, fallback=True), True
+        if fb and unknown is None:
+            unknown = (chain, fb)
+    if unknown:
+        return parse_data(unknown[1], unknown[0], contract, fallback=True), True
+    return None, True
+
+async def _refresh_once(key, lookup):
+    value, meta_fetched = await lookup()
+    if value is not None:
+        # partial enrichment is not worth keeping: the next lookup retries Solscan
+        meta = None if value.pending else value.meta()
+        _token_cache.store(key, value, meta, meta_fresh=meta_fetched)
+        snapshot_store.record(value)
+    return value
+
+async def _refresh(key, lookup):
     try:
-        pairs = _dex_search(contract) or []
-        if pairs:
-            on_chain = [p for p in pairs if p.get("chainId")==chain]
-            best = (max(on_chain, key=lambda x: ((x.get("liquidity") or {}).get("usd") or 0))
-                    if on_chain else max(pairs, key=lambda x: ((x.get("liquidity") or {}).get("usd") or 0)))
-            return parse_data(best, chain, contract, fallback=False)
+        return await _inflight.do(key, lambda: _refresh_once(key, lookup))
     except Exception as e:
-        print("Dexscreener /search error:", e)
+        print(f"token refresh error {key}:", e)
+        return None
 
-    print(f"Dexscreener failed. Falling back to chain API for {chain}:{contract}")
-    fb = fallback_fetch(chain, contract)
-    return parse_data(fb, chain, contract, fallback=True) if fb else None
+def _refresh_in_background(key, lookup):
+    with _bg_lock:
+        if key in _bg_refreshes:
+            return
+        task = asyncio.get_running_loop().create_task(_refresh(key, lookup))
+        _bg_refreshes[key] = task
+    task.add_done_callback(lambda t: _forget_background(key, t))
+
+def _forget_background(key, task):
+    with _bg_lock:
+        if _bg_refreshes.get(key) is task:
+            del _bg_refreshes[key]
+
+async def _cached(key, lookup):
+    """Serve fresh hits, serve stale hits while refreshing in the background, fetch on miss."""
+    value, state = _token_cache.lookup(key)
+    if state == STALE:
+        _refresh_in_background(key, lookup)
+    elif state == MISS:
+        value = await _refresh(key, lookup)
+    return dataclasses.replace(value) if value is not None else None
+
+async def fetch_token_data_async(chain: str, contract: str):
+    key = (chain, contract)
+    return await _cached(key, lambda: _lookup_token(key, chain, contract))
+
+async def fetch_token_data_any_async(contract: str):
+    """
+    Chain-agnostic lookup: one /tokens call (one /search on a miss), pick the
+    chain with the most liquidity, then fall back only on chains the address
+    format allows. Returns (chain, data); both None when nothing was found.
+    """
+    key = (None, contract)
+    snap = await _cached(key, lambda: _lookup_token_any(key, contract))
+    return (snap.chain, snap) if snap else (None, None)
 
-# ---------- movers / daily report ----------
+def fetch_token_data(chain: str, contract: str):
+    """Blocking wrapper for sync callers (x_bot, cron scripts)."""
+    return http_client.run_sync(fetch_token_data_async(chain, contract))
 
-_EXCLUDE = {"btc", "wbtc", "eth", "weth", "usdt", "usdc"}
+def fetch_token_data_any(contract: str):
+    return http_client.run_sync(fetch_token_data_any_async(contract))
 
-def get_top_movers_all(limit: int = 5):
+# ---------- bulk lookups ----------
+
+_DEX_BATCH = 30  # Dexscreener /tokens accepts up to 30 comma-separated addresses
+
+async def fetch_token_data_many_async(addresses, chain: str | None = None) -> dict:
     """
-    Cross-chain altcoin movers using /latest/dex/tokens.
-    Returns (gainers, losers) lists of strings like '$SYM (+12.3%)'.
+    Bulk lookup via comma-separated /tokens calls (30 per request, chunks in
+    parallel). Returns {address: TokenSnapshot-or-None} in input order; with
+    `chain` set, only pairs on that chain count.
+    Dexscreener fields only: no Solana enrichment, no chain fallbacks.
     """
-    try:
-        url = f"{CONFIG['DEXSCREENER_API']}/tokens"
-        pairs = requests.get(url, headers=CONFIG.get("DEFAULT_HEADERS", {}), timeout=20).json().get("pairs", [])
+    uniq = list(dict.fromkeys(a.strip() for a in addresses if a and a.strip()))
+    chunks = [uniq[i:i + _DEX_BATCH] for i in range(0, len(uniq), _DEX_BATCH)]
+    results = await asyncio.gather(
+        *(_dex_tokens_async(",".join(c)) for c in chunks), return_exceptions=True
+    )
 
-        def is_alt(p):
-            sym = (p.get("baseToken") or {}).get("symbol", "").lower()
-            return sym and sym not in _EXCLUDE
+    by_addr = {address_key(a): [] for a in uniq}
+    for res in results:
+        if isinstance(res, Exception):
+            print("Dexscreener bulk /tokens error:", res)
+            continue
+        for p in res or []:
+            addr = address_key((p.get("baseToken") or {}).get("address"))
+            if addr in by_addr:
+                by_addr[addr].append(p)
+
+    out = {}
+    for a in uniq:
+        pairs = by_addr[address_key(a)]
+        # an explicit chain with no pair there is "not found", not another chain's data
+        best = _best_pair(pairs, chain or _best_chain(pairs)) if pairs else None
+        if best is None:
+            out[a] = None
+            continue
+        out[a] = parse_data(best, best.get("chainId") or chain, a, fallback=False)
+        snapshot_store.record(out[a])
+    return out
 
-        alts = [p for p in pairs if is_alt(p)]
-        def chg(p): return (p.get("priceChange") or {}).get("h24") or 0.0
+def fetch_token_data_many(addresses, chain: str | None = None) -> dict:
+    return http_client.run_sync(fetch_token_data_many_async(addresses, chain))
 
-        up = sorted(alts, key=chg, reverse=True)[:limit]
-        down = sorted(alts, key=chg)[:limit]
+def token_cache_stats() -> dict:
+    return dict(_token_cache.stats(), singleflight=_inflight.stats())
 
-        def shape_str(p):
-            sym = (p.get("baseToken") or {}).get("symbol", "UNK")
-            return f"${sym} ({chg(p):+,.1f}%)"
+# ---------- movers / daily report ----------
 
-        return list(map(shape_str, up)), list(map(shape_str, down))
+def get_top_movers_all(limit: int = 5):
+    """
+    Cross-chain altcoin movers (24h), read from the background movers engine.
+    Returns (gainers, losers) lists of strings like '$SYM (+12.3%)'.
+    """
+    try:
+        return movers.top_movers("h24", limit)
     except Exception as e:
         print("get_top_movers_all error:", e)
         return [], []
@@ -283,11 +429,11 @@ def get_btc_24h_change_pct() -> str:
     """Coingecko simple API for BTC 24h % change."""
     try:
         url = "https://api.coingecko.com/api/v3/simple/price"
-        r = requests.get(url, params={
+        r = http_client.get(url, "coingecko", params={
             "ids": "bitcoin",
             "vs_currencies": "usd",
             "include_24hr_change": "true"
-        }, timeout=15).json()
+        }).json()
         pct = r["bitcoin"]["usd_24h_change"]
         return f"{pct:+.2f}%"
     except Exception as e:
@@ -304,7 +450,7 @@ def get_liquidations_btc_eth() -> dict:
             return {"BTC": "N/A", "ETH": "N/A"}
         url = "https://open-api.coinglass.com/api/pro/v1/futures/liquidation_chart"
         headers = {"coinglassSecret": COINGLASS_API_KEY}
-        r = requests.get(url, headers=headers, params={"timeType": "1"}, timeout=20)
+        r = http_client.get(url, "coinglass", headers=headers, params={"timeType": "1"})
         data = (r.json() or {}).get("data", [])
         out = {"BTC": "N/A", "ETH": "N/A"}
         for entry in data:
@@ -317,18 +463,57 @@ def get_liquidations_btc_eth() -> dict:
         return {"BTC": "N/A", "ETH": "N/A"}
 
 def build_daily_report_data():
-    g, l = get_top_movers_all(limit=5)
-    liq = get_liquidations_btc_eth()
-    return {
-        "btc_24h": get_btc_24h_change_pct(),
-        "gainers": g,
-        "losers": l,
-        "liq_btc": liq["BTC"],
-        "liq_eth": liq["ETH"],
-    }
-
-def build_daily_report_text() -> str:
-    d = build_daily_report_data()
+    """Fetch movers, liquidations and BTC 24h concurrently into one timestamped dict."""
+    with ThreadPoolExecutor(max_workers=3, thread_name_prefix="daily") as pool:
+        # each worker runs in a copy of our context so the rate-limit lane follows it
+        movers = pool.submit(contextvars.copy_context().run, get_top_movers_all, 5)
+        liq = pool.submit(contextvars.copy_context().run, get_liquidations_btc_eth)
+        btc = pool.submit(contextvars.copy_context().run, get_btc_24h_change_pct)
+        g, l = movers.result()
+        liq = liq.result()
+        return {
+            "ts": time.time(),
+            "btc_24h": btc.result(),
+            "gainers": g,
+            "losers": l,
+            "liq_btc": liq["BTC"],
+            "liq_eth": liq["ETH"],
+        }
+
+_daily_snapshot = None
+_daily_lock = threading.Lock()
+
+def _all_sources_failed(d: dict) -> bool:
+    return (d["btc_24h"] == "N/A" and d["liq_btc"] == "N/A" and d["liq_eth"] == "N/A"
+            and not d["gainers"] and not d["losers"])
+
+def _snapshot_fresh(snap, ttl: float) -> bool:
+    if not snap:
+        return False
+    if _all_sources_failed(snap):
+        # a blank report from one upstream blip is only reused briefly
+        ttl = min(ttl, CONFIG.get("DAILY_REPORT_FAILED_TTL", 30))
+    return time.time() - snap["ts"] <= ttl
+
+def get_daily_report_snapshot(max_age: float | None = None) -> dict:
+    """
+    The shared daily-report snapshot, rebuilt only when older than
+    DAILY_REPORT_TTL (DAILY_REPORT_FAILED_TTL when every source came back
+    empty). Concurrent callers wait for a single rebuild.
+    """
+    global _daily_snapshot
+    ttl = CONFIG.get("DAILY_REPORT_TTL", 600) if max_age is None else max_age
+    snap = _daily_snapshot
+    if _snapshot_fresh(snap, ttl):
+        return snap
+    with _daily_lock:
+        snap = _daily_snapshot
+        if not _snapshot_fresh(snap, ttl):
+            snap = _daily_snapshot = build_daily_report_data()
+    return snap
+
+def build_daily_report_text(d: dict | None = None) -> str:
+    d = d or get_daily_report_snapshot()
     liq_line = ""
     if d["liq_btc"] != "N/A" or d["liq_eth"] != "N/A":
         liq_line = f"💥 Liquidations (24h): BTC {d['liq_btc']} | ETH {d['liq_eth']}\n"
@@ -341,8 +526,8 @@ def build_daily_report_text() -> str:
         f"\n\n{pick_wisdom()}"
     )
 
-def build_x_daily_summary_text() -> str:
-    d = build_daily_report_data()
+def build_x_daily_summary_text(d: dict | None = None) -> str:
+    d = d or get_daily_report_snapshot()
     g = d["gainers"][0] if d["gainers"] else "N/A"
     l = d["losers"][0]  if d["losers"]  else "N/A"
     liq_line = ""
@@ -0,0 +1,173 @@
+# rate_limit.py
+"""
+Client-side token buckets per upstream host, with two priority lanes.
+
+Interactive work (/analyze, CA pastes) may drain a bucket to empty; background
+work (daily croak, pollers, cron posts) stops at a reserve so it never starves
+a user-facing lookup. Callers wait for a token up to their lane's max wait
+instead of firing into a 429. A 429 with Retry-After blocks the whole bucket
+until that moment.
+
+`acquire` is for worker threads (it sleeps); coroutines use `aacquire`. A
+sync call that lands on an event loop thread anyway gets no wait at all, so
+it fails fast instead of stalling the loop.
+"""
+import asyncio
+import contextvars
+import email.utils
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+from config import CONFIG
+
+INTERACTIVE, BACKGROUND = "interactive", "background"
+
+_lane = contextvars.ContextVar("rate_limit_lane", default=INTERACTIVE)
+
+class RateLimitedError(Exception):
+    """No token became available within the lane's max wait."""
+
+@contextmanager
+def lane(name: str):
+    """Run the enclosed calls in a priority lane (INTERACTIVE or BACKGROUND)."""
+    token = _lane.set(name)
+    try:
+        yield
+    finally:
+        _lane.reset(token)
+
+def current_lane() -> str:
+    return _lane.get()
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+_MIN_PER_MIN = 0.1  # a zero rate would never refill (and divide by zero)
+
+class TokenBucket:
+    def __init__(self, per_min: float, burst: float, background_reserve: float = 0.25):
+        self.rate = max(per_min, _MIN_PER_MIN) / 60.0
+        self.burst = max(1.0, burst)
+        self.reserve = background_reserve * self.burst
+        self.tokens = self.burst
+        self._stamp = time.monotonic()
+        self._blocked_until = 0.0
+        self._counts = {"granted": 0, "waited": 0, "rejected": 0, "throttled_429": 0}
+        self._lock = threading.Lock()
+
+    def _try_take(self, lane_name: str) -> float:
+        """Take a token and return 0, or return how long to wait before trying again."""
+        now = time.monotonic()
+        with self._lock:
+            self.tokens = min(self.burst, self.tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            if now < self._blocked_until:
+                return self._blocked_until - now
+            floor = self.reserve if lane_name == BACKGROUND else 0.0
+            if self.tokens - 1.0 >= floor:
+                self.tokens -= 1.0
+                self._counts["granted"] += 1
+                return 0.0
+            return (1.0 + floor - self.tokens) / self.rate
+
+    def _give_up(self, waited: bool):
+        with self._lock:
+            self._counts["rejected"] += 1
+            if waited:
+                self._counts["waited"] += 1
+
+    def _note_wait(self):
+        with self._lock:
+            self._counts["waited"] += 1
+
+    def acquire(self, lane_name: str, max_wait: float):
+        """Blocking take for worker threads; on an event loop thread it never sleeps."""
+        if _on_event_loop():
+            max_wait = 0.0
+        deadline = time.monotonic() + max_wait
+        waited = False
+        while True:
+            w = self._try_take(lane_name)
+            if w <= 0:
+                if waited: self._note_wait()
+                return
+            if time.monotonic() + w > deadline:
+                self._give_up(waited)
+                raise RateLimitedError(f"no token within {max_wait}s")
+            waited = True
+            time.sleep(min(w, 0.25))
+
+    async def aacquire(self, lane_name: str, max_wait: float):
+        deadline = time.monotonic() + max_wait
+        waited = False
+        while True:
+            w = self._try_take(lane_name)
+            if w <= 0:
+                if waited: self._note_wait()
+                return
+            if time.monotonic() + w > deadline:
+                self._give_up(waited)
+                raise RateLimitedError(f"no token within {max_wait}s")
+            waited = True
+            await asyncio.sleep(min(w, 0.25))
+
+    def penalize(self, retry_after: float):
+        """Upstream said 429: empty the bucket and hold everyone off until Retry-After."""
+        with self._lock:
+            self.tokens = 0.0
+            self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+            self._counts["throttled_429"] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(
+                self._counts,
+                tokens=round(self.tokens, 2),
+                per_min=round(self.rate * 60, 1),
+                blocked_for_s=round(max(0.0, self._blocked_until - time.monotonic()), 1),
+            )
+
+_buckets: dict = {}
+_buckets_lock = threading.Lock()
+
+def bucket_for(url: str) -> TokenBucket | None:
+    """The bucket for url's host, or None when that host has no configured limit."""
+    host = (urlsplit(url).hostname or "").lower()
+    b = _buckets.get(host)
+    if b is None:
+        spec = CONFIG.get("RATE_LIMITS", {}).get(host)
+        if not spec:
+            return None
+        with _buckets_lock:
+            b = _buckets.get(host)
+            if b is None:
+                b = _buckets[host] = TokenBucket(
+                    spec["per_min"], spec["burst"], CONFIG.get("RATE_LIMIT_BACKGROUND_RESERVE", 0.25)
+                )
+    return b
+
+def max_wait() -> float:
+    return CONFIG.get("RATE_LIMIT_MAX_WAIT", {}).get(current_lane(), 5.0)
+
+def retry_after_seconds(value: str | None, default: float = 5.0) -> float:
+    """Parse a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        dt = email.utils.parsedate_to_datetime(value)
+        return max(0.0, dt.timestamp() - time.time())
+    except Exception:
+        return default
+
+def snapshot() -> dict:
+    return {host: b.snapshot() for host, b in sorted(_buckets.items())}
@@ -0,0 +1,78 @@
+# risk.py
+"""
+Risk levels from liquidity, 24h volume, FDV/liquidity ratio and LP lock.
+
+`risk_level` scores one token; `risk_levels` scores whole columns in one
+vectorized NumPy pass with the same thresholds (bench_risk.py checks the two
+agree). Levels are coded 0 = low, 1 = medium, 2 = high. NumPy is imported by
+the batch functions only, so scalar callers never load it.
+"""
+from token_snapshot import LpStatus
+
+LEVELS = ("low", "medium", "high")
+RISK_BADGES = {"low": "🔹 Low", "medium": "🔷 Medium", "high": "🔷🔷 High"}
+
+def risk_level(liq: float, vol: float, fdv: float, lp_locked: bool) -> str:
+    ratio = (fdv / liq) if liq > 0 else float("inf")
+
+    if liq >= 500_000 and vol >= 300_000 and ratio < 50:
+        level = "low"
+    elif liq >= 100_000 and vol >= 50_000:
+        level = "medium"
+    else:
+        level = "high"
+
+    if lp_locked and level == "high":
+        level = "medium"
+    elif lp_locked and level == "medium" and liq >= 400_000 and vol >= 200_000 and ratio < 60:
+        level = "low"
+    return level
+
+def risk_levels(liq, vol, fdv, lp_locked) -> "np.ndarray":
+    """Vectorized risk_level over equal-length columns. Returns int8 codes (index into LEVELS)."""
+    import numpy as np
+
+    liq = np.asarray(liq, dtype=np.float64)
+    vol = np.asarray(vol, dtype=np.float64)
+    fdv = np.asarray(fdv, dtype=np.float64)
+    lp = np.asarray(lp_locked, dtype=bool)
+
+    ratio = np.full(liq.shape, np.inf)
+    np.divide(fdv, liq, out=ratio, where=liq > 0)
+
+    low = (liq >= 500_000) & (vol >= 300_000) & (ratio < 50)
+    medium = ~low & (liq >= 100_000) & (vol >= 50_000)
+    level = np.where(low, 0, np.where(medium, 1, 2)).astype(np.int8)
+
+    # LP lock: high -> medium, and a strong medium -> low (from the unadjusted level)
+    promote = lp & medium & (liq >= 400_000) & (vol >= 200_000) & (ratio < 60)
+    level[lp & (level == 2)] = 1
+    level[promote] = 0
+    return level
+
+def risk_scores(levels, liq) -> "np.ndarray":
+    """
+    Sortable risk score, higher = riskier. The level sets the integer part;
+    within a level, deeper liquidity sorts as safer.
+    """
+    import numpy as np
+
+    liq = np.nan_to_num(np.asarray(liq, dtype=np.float64), nan=0.0)
+    depth = 1.0 / (1.0 + np.log1p(np.maximum(liq, 0.0)))
+    return np.asarray(levels, dtype=np.float64) + 0.999 * depth
+
+def risk_badges(levels) -> list[str]:
+    badges = [RISK_BADGES[l] for l in LEVELS]
+    return [badges[int(c)] for c in levels]
+
+def score_snapshots(snaps) -> tuple[list[str], "np.ndarray"]:
+    """(badges, scores) for a list of TokenSnapshots, in input order."""
+    import numpy as np
+
+    n = len(snaps)
+    liq = np.fromiter(((s.liquidity or 0.0) for s in snaps), dtype=np.float64, count=n)
+    vol = np.fromiter(((s.volume_24h or 0.0) for s in snaps), dtype=np.float64, count=n)
+    fdv = np.fromiter(((s.fdv or 0.0) for s in snaps), dtype=np.float64, count=n)
+    lp = np.fromiter((s.lp is LpStatus.LOCKED for s in snaps), dtype=bool, count=n)
+    levels = risk_levels(liq, vol, fdv, lp)
+    return risk_badges(levels), risk_scores(levels, liq)
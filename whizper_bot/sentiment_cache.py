@@ -0,0 +1,96 @@
+# sentiment_cache.py
+"""
+Memoized headline sentiment.
+
+VADER scores are keyed by a hash of (link, title, summary), so a headline is
+scored once no matter how many feeds, jobs or commands see it again; an
+edited title or summary hashes differently and is re-scored. Bounded LRU,
+optionally persisted to a JSON file. stats() reports the hit rate and the
+CPU time spent scoring.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+def headline_key(link: str, title: str, summary: str) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    for part in (link, title, summary):
+        h.update((part or "").encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+class SentimentCache:
+    def __init__(self, max_entries: int = 5000, path: str | None = None):
+        self.max_entries = max_entries
+        self.path = path
+        self._scores: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._counts = {"hits": 0, "misses": 0, "evictions": 0}
+        self._score_cpu = 0.0
+        self._load()
+
+    def score(self, link: str, title: str, summary: str, scorer) -> float:
+        """Cached scorer(text) for this headline; text is 'title. summary' as before."""
+        key = headline_key(link, title, summary)
+        with self._lock:
+            s = self._scores.get(key)
+            if s is not None:
+                self._scores.move_to_end(key)
+                self._counts["hits"] += 1
+                return s
+            self._counts["misses"] += 1
+
+        t0 = time.process_time()
+        s = scorer(f"{title}. {summary}")
+        cpu = time.process_time() - t0
+
+        with self._lock:
+            self._score_cpu += cpu
+            self._scores[key] = s
+            self._scores.move_to_end(key)
+            while len(self._scores) > self.max_entries:
+                self._scores.popitem(last=False)
+                self._counts["evictions"] += 1
+            self._dirty = True
+        return s
+
+    # ---------- persistence ----------
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as fh:
+                raw = json.load(fh)
+            for k, v in list(raw.items())[-self.max_entries:]:
+                self._scores[k] = float(v)
+        except Exception as e:
+            print("sentiment cache load error:", e)
+
+    def save(self):
+        if not self.path or not self._dirty:
+            return
+        with self._lock:
+            raw = dict(self._scores)
+            self._dirty = False
+        tmp = f"{self.path}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as fh:
+                json.dump(raw, fh)
+            os.replace(tmp, self.path)
+        except Exception as e:
+            print("sentiment cache save error:", e)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._counts["hits"] + self._counts["misses"]
+            return dict(
+                self._counts,
+                entries=len(self._scores),
+                hit_rate=round(self._counts["hits"] / lookups, 3) if lookups else None,
+                scoring_cpu_ms=round(self._score_cpu * 1000, 1),
+            )
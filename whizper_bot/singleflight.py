@@ -0,0 +1,69 @@
+# singleflight.py
+"""
+Request coalescing: concurrent callers asking for the same key share one
+in-flight call and get its result (or its exception).
+
+The shared handle is a concurrent.futures.Future, so followers may sit on a
+different event loop or thread than the leader (Telegram loop, FastAPI loop,
+the http_client background loop used by sync callers).
+
+Cancellation is personal: a cancelled leader does not cancel its followers
+(they elect a new leader and run the call again), and a cancelled follower
+leaves the shared call alone.
+"""
+import asyncio
+import concurrent.futures
+import threading
+
+class _LeaderCancelled(Exception):
+    """Set on the shared future when the leader was cancelled; followers retry."""
+
+class SingleFlight:
+    def __init__(self):
+        self._calls: dict = {}
+        self._lock = threading.Lock()
+        self._counts = {"leaders": 0, "coalesced": 0, "reelected": 0}
+
+    async def do(self, key, fn):
+        """Await fn() once per key; concurrent callers for that key await the same result."""
+        while True:
+            with self._lock:
+                fut = self._calls.get(key)
+                leader = fut is None
+                if leader:
+                    fut = concurrent.futures.Future()
+                    self._calls[key] = fut
+                    self._counts["leaders"] += 1
+                else:
+                    self._counts["coalesced"] += 1
+            if leader:
+                break
+            try:
+                # shield: a follower's own cancellation must not cancel the shared future
+                return await asyncio.shield(asyncio.wrap_future(fut))
+            except _LeaderCancelled:
+                with self._lock:
+                    self._counts["reelected"] += 1
+
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            self._release(key)
+            fut.set_exception(_LeaderCancelled())
+            raise
+        except BaseException as e:
+            self._release(key)
+            fut.set_exception(e)
+            raise
+        self._release(key)
+        fut.set_result(result)
+        return result
+
+    def _release(self, key):
+        # drop the key before waking followers, so a retrying follower finds it free
+        with self._lock:
+            self._calls.pop(key, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._counts, in_flight=len(self._calls))
@@ -0,0 +1,203 @@
+# snapshot_store.py
+"""
+Append-only local history of token snapshots (SQLite, WAL mode).
+
+Rows are keyed by (chain, contract, ts) in a WITHOUT ROWID table, so a
+contract's history is one contiguous range of the primary key and "last N
+hours" is an index range scan. Lookups only enqueue a row; a writer thread
+batches inserts and periodically folds raw rows older than `raw_hours` into
+one averaged row per hour, then drops anything past `keep_days`.
+"""
+import queue
+import sqlite3
+import threading
+import time
+
+from config import CONFIG
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    chain      TEXT    NOT NULL,
+    contract   TEXT    NOT NULL,
+    ts         INTEGER NOT NULL,
+    price      REAL,
+    liquidity  REAL,
+    volume_24h REAL,
+    fdv        REAL,
+    holders    INTEGER,
+    res        INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (chain, contract, ts)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS snapshots_res_ts ON snapshots (res, ts);
+"""
+
+_COLUMNS = ("ts", "price", "liquidity", "volume_24h", "fdv", "holders")
+
+def _key(chain, contract) -> tuple[str, str]:
+    # EVM addresses are case-insensitive; Solana/Sui ones are not
+    contract = contract or ""
+    return (chain or "").lower(), (contract.lower() if contract.startswith("0x") else contract)
+
+class SnapshotStore:
+    def __init__(self, path: str, min_interval: float = 60, raw_hours: float = 48,
+                 keep_days: float = 30, compact_every: float = 3600, flush_every: float = 1.0):
+        self.path = path
+        self.min_interval = min_interval
+        self.raw_hours = raw_hours
+        self.keep_days = keep_days
+        self.compact_every = compact_every
+        self.flush_every = flush_every
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        self._last_write: dict = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writer = None
+        self._counts = {"queued": 0, "skipped": 0, "written": 0, "compactions": 0, "errors": 0}
+
+    # ---------- connections ----------
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def _reader(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    # ---------- writes ----------
+
+    def record(self, snap) -> None:
+        """Queue one snapshot. Cheap: no I/O on the caller's thread."""
+        if snap is None or snap.price is None:
+            return
+        chain, contract = _key(snap.chain, snap.contract)
+        if not chain or not contract:
+            return
+        now = int(time.time())
+        with self._lock:
+            last = self._last_write.get((chain, contract))
+            if last is not None and now - last < self.min_interval:
+                self._counts["skipped"] += 1
+                return
+            if len(self._last_write) > 50_000:
+                self._last_write.clear()
+            self._last_write[(chain, contract)] = now
+            self._counts["queued"] += 1
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, name="snapshot-store", daemon=True)
+                self._writer.start()
+        self._queue.put((chain, contract, now, snap.price, snap.liquidity,
+                         snap.volume_24h, snap.fdv, snap.holders))
+
+    def _write_loop(self):
+        conn = self._connect()
+        next_compact = time.monotonic() + 60
+        while True:
+            rows = []
+            try:
+                rows.append(self._queue.get(timeout=self.flush_every))
+                while len(rows) < 500:
+                    rows.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+            try:
+                if rows:
+                    with conn:
+                        conn.executemany(
+                            "INSERT OR REPLACE INTO snapshots "
+                            "(chain, contract, ts, price, liquidity, volume_24h, fdv, holders) "
+                            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                    self._counts["written"] += len(rows)
+                if time.monotonic() >= next_compact:
+                    self.compact(conn)
+                    next_compact = time.monotonic() + self.compact_every
+            except Exception as e:
+                self._counts["errors"] += 1
+                print("snapshot store write error:", e)
+
+    def compact(self, conn: sqlite3.Connection | None = None) -> None:
+        """Downsample raw rows past raw_hours to hourly averages; drop rows past keep_days."""
+        conn = conn or self._reader()
+        now = int(time.time())
+        # aligned to the hour so each bucket is folded exactly once
+        cutoff = (now - int(self.raw_hours * 3600)) // 3600 * 3600
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO snapshots "
+                "(chain, contract, ts, price, liquidity, volume_24h, fdv, holders, res) "
+                "SELECT chain, contract, (ts / 3600) * 3600, AVG(price), AVG(liquidity), "
+                "AVG(volume_24h), AVG(fdv), MAX(holders), 3600 "
+                "FROM snapshots WHERE res = 0 AND ts < ? "
+                "GROUP BY chain, contract, ts / 3600", (cutoff,))
+            conn.execute("DELETE FROM snapshots WHERE res = 0 AND ts < ?", (cutoff,))
+            conn.execute("DELETE FROM snapshots WHERE ts < ?", (now - int(self.keep_days * 86400),))
+        self._counts["compactions"] += 1
+
+    # ---------- queries ----------
+
+    def history(self, chain: str, contract: str, hours: float = 24) -> list[dict]:
+        """Snapshots for one contract over the last `hours`, oldest first."""
+        chain, contract = _key(chain, contract)
+        rows = self._reader().execute(
+            "SELECT ts, price, liquidity, volume_24h, fdv, holders FROM snapshots "
+            "WHERE chain = ? AND contract = ? AND ts >= ? ORDER BY ts",
+            (chain, contract, int(time.time() - hours * 3600))).fetchall()
+        return [dict(zip(_COLUMNS, r)) for r in rows]
+
+    def previous(self, chain: str, contract: str, before: float | None = None) -> dict | None:
+        """Latest snapshot strictly older than `before` (default: older than min_interval)."""
+        chain, contract = _key(chain, contract)
+        if before is None:
+            before = time.time() - self.min_interval
+        row = self._reader().execute(
+            "SELECT ts, price, liquidity, volume_24h, fdv, holders FROM snapshots "
+            "WHERE chain = ? AND contract = ? AND ts < ? ORDER BY ts DESC LIMIT 1",
+            (chain, contract, int(before))).fetchone()
+        return dict(zip(_COLUMNS, row)) if row else None
+
+    def change_pct(self, chain: str, contract: str, price: float | None,
+                   before: float | None = None) -> tuple[float, float] | None:
+        """(price % change, age in seconds) versus the snapshot found by previous()."""
+        prev = self.previous(chain, contract, before)
+        if not prev or not prev["price"] or price is None:
+            return None
+        return (price / prev["price"] - 1) * 100, time.time() - prev["ts"]
+
+    def stats(self) -> dict:
+        return dict(self._counts, pending=self._queue.qsize(), path=self.path)
+
+_cfg = CONFIG["SNAPSHOT_STORE"]
+store = SnapshotStore(
+    _cfg["path"],
+    min_interval=_cfg["min_interval"],
+    raw_hours=_cfg["raw_hours"],
+    keep_days=_cfg["keep_days"],
+) if _cfg["path"] else None
+
+def record(snap) -> None:
+    if store is not None:
+        try:
+            store.record(snap)
+        except Exception as e:
+            print("snapshot store record error:", e)
+
+def since_last_check(chain: str, contract: str, price: float | None) -> tuple[float, float] | None:
+    """(pct, age_seconds) of price versus the previous check, or None without history."""
+    if store is None:
+        return None
+    try:
+        return store.change_pct(chain, contract, price)
+    except Exception as e:
+        print("snapshot store query error:", e)
+        return None
+
+def history(chain: str, contract: str, hours: float = 24) -> list[dict]:
+    return store.history(chain, contract, hours) if store is not None else []
+
+def stats() -> dict:
+    return store.stats() if store is not None else {"disabled": True}
@@ -0,0 +1,87 @@
+# startup_profile.py
+"""
+Import-time profiler for the entry points (x_bot, Legacy/x_poster,
+telegram_bot, web_ui).
+
+Enable it with `--profile-startup` on the command line or
+WHIZPER_PROFILE_STARTUP=1 in the environment (the env var is the way in
+for uvicorn-launched web_ui). Every module executed after `enable()` is
+timed; `report()` prints the slowest ones with self and cumulative time,
+like `python -X importtime` but without needing interpreter flags on a
+cron or PaaS command line.
+
+`enable()` has to run before the entry point's imports, so it sits at the
+top of the module, but it only installs the hook when asked and leaves
+sys.argv alone. Entry points read their arguments through `args()` and
+call `report()` from main().
+"""
+import os
+import sys
+import time
+
+FLAG = "--profile-startup"
+
+_records: list[tuple[str, float, float]] = []   # (module, self_s, cumulative_s)
+_stack: list[list] = []                         # [module, start, child_time]
+_t0 = None
+
+def requested() -> bool:
+    return FLAG in sys.argv or os.getenv("WHIZPER_PROFILE_STARTUP", "").lower() in ("1", "true", "yes")
+
+class _TimingFinder:
+    """Meta-path shim: finds specs through the real finders and times loader.exec_module."""
+
+    def find_spec(self, fullname, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        loader = spec.loader
+        # shared class-level loaders (builtins, frozen) are left alone
+        if loader is None or isinstance(loader, type) or not hasattr(loader, "exec_module"):
+            return spec
+        exec_module = loader.exec_module
+
+        def timed_exec(module, _exec=exec_module, _name=fullname):
+            frame = [_name, time.perf_counter(), 0.0]
+            _stack.append(frame)
+            try:
+                _exec(module)
+            finally:
+                _stack.pop()
+                total = time.perf_counter() - frame[1]
+                _records.append((_name, total - frame[2], total))
+                if _stack:
+                    _stack[-1][2] += total
+
+        loader.exec_module = timed_exec
+        return spec
+
+def enable() -> bool:
+    """Start timing imports if profiling was requested."""
+    global _t0
+    if not requested() or _t0 is not None:
+        return False
+    _t0 = time.perf_counter()
+    sys.meta_path.insert(0, _TimingFinder())
+    return True
+
+def args(argv: list[str] | None = None) -> list[str]:
+    """Command-line arguments without the profiling flag."""
+    return [a for a in (sys.argv[1:] if argv is None else argv) if a != FLAG]
+
+def report(entry: str = "", top: int = 25, file=None) -> None:
+    """Print the slowest imports since enable() (no-op when profiling is off)."""
+    if _t0 is None:
+        return
+    file = file or sys.stderr
+    elapsed = time.perf_counter() - _t0
+    print(f"startup profile{(' for ' + entry) if entry else ''}: "
+          f"{elapsed * 1000:.0f} ms, {len(_records)} modules", file=file)
+    print(f"{'self ms':>9} {'cumul ms':>9}  module", file=file)
+    for name, self_s, cum_s in sorted(_records, key=lambda r: r[2], reverse=True)[:top]:
+        print(f"{self_s * 1000:>9.1f} {cum_s * 1000:>9.1f}  {name}", file=file)
@@ -1,4 +1,7 @@
 # telegram_bot.py
+import startup_profile
+startup_profile.enable()  # --profile-startup / WHIZPER_PROFILE_STARTUP=1: time every import below
+
 import os
 from dotenv import load_dotenv
 from telegram.ext import ApplicationBuilder
@@ -8,6 +11,7 @@ load_dotenv()
 BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN", "")
 
 def main():
+    startup_profile.report("telegram_bot")
     if not BOT_TOKEN:
         raise RuntimeError("TELEGRAM_BOT_TOKEN missing")
 
@@ -0,0 +1,6 @@
+# conftest.py
+"""The bot's modules import each other flat (`import circuit`), as when run from whizper_bot/."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
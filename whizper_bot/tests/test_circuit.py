@@ -0,0 +1,63 @@
+# test_circuit.py
+import pytest
+
+import circuit
+from circuit import CALL, CLOSED, HALF_OPEN, OPEN, PROBE, CircuitBreaker
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(circuit.time, "monotonic", lambda: now[0])
+    return now
+
+def _tripped(**kw) -> CircuitBreaker:
+    b = CircuitBreaker("t", min_calls=2, error_rate=0.5, open_for=30, **kw)
+    for _ in range(2):
+        b.record(False, 0.1, b.allow())
+    return b
+
+def test_trips_at_error_rate(clock):
+    b = CircuitBreaker("t", min_calls=4, error_rate=0.5)
+    for ok in (True, True, False):
+        b.record(ok, 0.1, b.allow())
+    assert b.state == CLOSED
+    b.record(False, 0.1, b.allow())
+    assert b.state == OPEN
+    assert b.allow() == ""
+
+def test_slow_calls_count_as_failures(clock):
+    b = CircuitBreaker("t", min_calls=2, slow_call=1.0)
+    b.record(True, 2.0, b.allow())
+    b.record(True, 2.0, b.allow())
+    assert b.state == OPEN
+
+def test_half_open_single_probe_then_close(clock):
+    b = _tripped()
+    clock[0] += 30
+    assert b.allow() == PROBE
+    assert b.state == HALF_OPEN
+    assert b.allow() == ""  # only one probe in flight
+    b.record(True, 0.1, PROBE)
+    assert b.state == CLOSED
+    assert b.allow() == CALL
+
+def test_failed_probe_reopens(clock):
+    b = _tripped()
+    clock[0] += 30
+    b.record(False, 0.1, b.allow())
+    assert b.state == OPEN
+    assert b.snapshot()["trips"] == 2
+
+def test_late_result_ignored_while_half_open(clock):
+    b = _tripped()
+    clock[0] += 30
+    assert b.allow() == PROBE
+    b.record(True, 0.1, CALL)   # started before the trip, lands now
+    assert b.state == HALF_OPEN
+    assert b.allow() == ""      # the probe is still the one in flight
+
+def test_abandoned_probe_frees_slot(clock):
+    b = _tripped()
+    clock[0] += 30
+    b.abandon(b.allow())
+    assert b.allow() == PROBE
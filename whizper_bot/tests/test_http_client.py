@@ -0,0 +1,63 @@
+# test_http_client.py
+import http.server
+import threading
+
+import pytest
+from requests.adapters import HTTPAdapter
+
+import http_client
+from config import CONFIG
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so the pool can reuse the socket
+    seen: list = []
+
+    def do_GET(self):
+        _Handler.seen.append(dict(self.headers))
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def server():
+    srv = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    _Handler.seen.clear()
+    yield f"http://127.0.0.1:{srv.server_address[1]}"
+    srv.shutdown()
+    srv.server_close()
+
+@pytest.fixture
+def fresh_session(monkeypatch):
+    monkeypatch.setattr(http_client, "_session", None)
+
+def test_session_is_shared_and_pooled(fresh_session):
+    s = http_client.session()
+    assert http_client.session() is s
+    adapter = s.get_adapter("https://api.dexscreener.com/")
+    assert isinstance(adapter, HTTPAdapter)
+    assert adapter._pool_connections == CONFIG["HTTP_POOL_CONNECTIONS"]
+    assert adapter._pool_maxsize == CONFIG["HTTP_POOL_MAXSIZE"]
+    assert s.get_adapter("http://example.com/") is s.get_adapter("https://example.com/")
+
+def test_default_headers_sent_and_mergeable(fresh_session, server):
+    http_client.get(f"{server}/a", headers={"X-Extra": "1"})
+    sent = _Handler.seen[-1]
+    assert sent["User-Agent"] == CONFIG["DEFAULT_HEADERS"]["User-Agent"]
+    assert "gzip" in sent["Accept-Encoding"]
+    assert sent["X-Extra"] == "1"
+
+def test_pool_stats_counts_reused_connections(fresh_session, server):
+    for _ in range(3):
+        assert http_client.get_json(f"{server}/x") == {"ok": True}
+    stats = http_client.pool_stats()[server.rsplit(":", 1)[0]]  # keyed scheme://host
+    assert stats == {"requests": 3, "connections": 1, "reused": 2}
+
+def test_pool_stats_before_first_use(fresh_session):
+    assert set(http_client.pool_stats()) == {"aiohttp"}
@@ -0,0 +1,77 @@
+# test_movers.py
+import pytest
+
+import movers
+from movers import MoversEngine
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(movers.time, "time", lambda: now[0])
+    return now
+
+def _pair(sym, chg, liq=100_000, pair=None, chain="solana"):
+    return {
+        "baseToken": {"symbol": sym, "address": sym.lower()},
+        "chainId": chain,
+        "pairAddress": pair or f"{sym}-pair",
+        "liquidity": {"usd": liq},
+        "volume": {"h24": 50_000},
+        "priceChange": {"h1": chg, "h6": chg, "h24": chg},
+    }
+
+def _engine(**kw):
+    return MoversEngine(min_liquidity=10_000, min_volume=5_000, max_age=60, **kw)
+
+def test_top_k_gainers_and_losers(clock):
+    e = _engine()
+    e.ingest([_pair(f"T{i}", i - 5) for i in range(11)])
+    assert [r.symbol for r in e.top("24h", 3)] == ["T10", "T9", "T8"]
+    assert [r.symbol for r in e.top("h24", 2, gainers=False)] == ["T0", "T1"]
+    gainers, losers = e.top_movers("h24", 1)
+    assert gainers == ["$T10 (+5.0%)"] and losers == ["$T0 (-5.0%)"]
+
+def test_update_supersedes_old_entry(clock):
+    e = _engine()
+    e.ingest([_pair("A", 50), _pair("B", 10)])
+    e.ingest([_pair("A", -50)])
+    assert [r.symbol for r in e.top("h24", 2)] == ["B", "A"]
+
+def test_shallower_pair_does_not_replace(clock):
+    e = _engine()
+    e.ingest([_pair("A", 5, liq=500_000)])
+    e.ingest([_pair("A", 90, liq=20_000, pair="other")])
+    assert e.top("h24", 1)[0].changes["h24"] == 5
+
+def test_filters_and_exclusions(clock):
+    e = _engine()
+    e.ingest([_pair("THIN", 99, liq=100), _pair("WETH", 80)])
+    assert e.top("h24", 5) == []
+
+def test_stale_records_are_evicted(clock):
+    e = _engine()
+    e.ingest([_pair(f"OLD{i}", i) for i in range(50)])
+    clock[0] += 61
+    e.ingest([_pair("NEW", 1)])
+    assert [r.symbol for r in e.top("h24", 5)] == ["NEW"]
+    assert e.symbols() == ["NEW"]
+    st = e.stats()
+    assert st["records"] == 1 and st["evicted"] == 50
+
+def test_heaps_stay_bounded_under_churn(clock):
+    e = _engine()
+    for i in range(2000):
+        clock[0] += 1
+        e.ingest([_pair(f"T{i}", i % 7)])
+    st = e.stats()
+    assert st["records"] <= 60 + 15  # max_age, plus up to one sweep interval (max_age / 4)
+    assert max(st["heap_entries"].values()) <= 2 * (4 * st["records"] + 64)
+
+def test_offer_is_folded_in_on_query(clock):
+    e = _engine()
+    e.offer([_pair("Q", 3)])
+    assert [r.symbol for r in e.top("h24", 1)] == ["Q"]
+
+def test_unknown_window():
+    with pytest.raises(ValueError):
+        _engine().top("h48")
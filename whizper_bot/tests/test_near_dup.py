@@ -0,0 +1,39 @@
+# test_near_dup.py
+from near_dup import cluster, jaccard, minhash, shingles
+
+def _items(*titles):
+    return [{"title": t, "source": f"outlet{i}"} for i, t in enumerate(titles)]
+
+def test_shingles_drop_stopwords_and_outlet_tag():
+    assert shingles("The SEC approves Ether ETF - Reuters") == frozenset({"sec", "approves", "ether", "etf"})
+
+def test_minhash_is_deterministic():
+    w = shingles("bitcoin hits record high")
+    assert minhash(w) == minhash(frozenset(w))
+    assert len(minhash(w)) == 32
+
+def test_jaccard():
+    assert jaccard(frozenset("ab"), frozenset("ab")) == 1.0
+    assert jaccard(frozenset("ab"), frozenset("cd")) == 0.0
+    assert jaccard(frozenset(), frozenset()) == 1.0
+
+def test_syndicated_copies_cluster():
+    items = _items(
+        "SEC approves spot Ether ETF applications",
+        "SEC Approves Spot Ether ETF Applications - Reuters",
+        "Spot Ether ETF applications approved by SEC | CoinDesk",
+        "Bitcoin miners sell reserves after halving",
+    )
+    clusters = cluster(items)
+    assert [len(c.members) for c in clusters] == [3, 1]
+    assert clusters[0].rep is items[0]
+    assert clusters[0].source_count == 3
+
+def test_unrelated_headlines_stay_apart():
+    items = _items("Fed holds rates steady", "Solana outage halts block production", "Oil slides on China demand")
+    assert len(cluster(items)) == 3
+
+def test_threshold_is_respected():
+    items = _items("alpha beta gamma delta", "alpha beta gamma epsilon")  # Jaccard 0.6
+    assert len(cluster(items, threshold=0.6)) == 1
+    assert len(cluster(items, threshold=0.7)) == 2
@@ -0,0 +1,64 @@
+# test_rate_limit.py
+import asyncio
+
+import pytest
+
+import rate_limit
+from rate_limit import BACKGROUND, INTERACTIVE, RateLimitedError, TokenBucket
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    return now
+
+def test_interactive_drains_to_empty(clock):
+    b = TokenBucket(per_min=60, burst=4, background_reserve=0.5)
+    assert [b._try_take(INTERACTIVE) for _ in range(4)] == [0.0] * 4
+    assert b._try_take(INTERACTIVE) == pytest.approx(1.0)  # one token per second
+
+def test_background_stops_at_reserve(clock):
+    b = TokenBucket(per_min=60, burst=4, background_reserve=0.5)
+    assert b._try_take(BACKGROUND) == 0.0
+    assert b._try_take(BACKGROUND) == 0.0
+    assert b._try_take(BACKGROUND) > 0     # the last two tokens are held back
+    assert b._try_take(INTERACTIVE) == 0.0 # ...for interactive callers
+
+def test_refill(clock):
+    b = TokenBucket(per_min=60, burst=2)
+    b._try_take(INTERACTIVE)
+    b._try_take(INTERACTIVE)
+    clock[0] += 1.0
+    assert b._try_take(INTERACTIVE) == 0.0
+
+def test_penalize_blocks_until_retry_after(clock):
+    b = TokenBucket(per_min=600, burst=10)
+    b.penalize(5)
+    assert b._try_take(INTERACTIVE) == pytest.approx(5)
+    clock[0] += 5
+    assert b._try_take(INTERACTIVE) == 0.0
+
+def test_zero_rate_does_not_divide_by_zero():
+    b = TokenBucket(per_min=0, burst=1)
+    b.acquire(INTERACTIVE, 0)
+    with pytest.raises(RateLimitedError):
+        b.acquire(INTERACTIVE, 0)
+
+def test_sync_acquire_never_sleeps_on_a_loop():
+    async def take_twice():
+        b = TokenBucket(per_min=60, burst=1)
+        b.acquire(INTERACTIVE, 30)
+        b.acquire(INTERACTIVE, 30)
+    with pytest.raises(RateLimitedError):
+        asyncio.run(take_twice())
+
+def test_lane_context():
+    assert rate_limit.current_lane() == INTERACTIVE
+    with rate_limit.lane(BACKGROUND):
+        assert rate_limit.current_lane() == BACKGROUND
+    assert rate_limit.current_lane() == INTERACTIVE
+
+def test_retry_after_parsing():
+    assert rate_limit.retry_after_seconds("7") == 7.0
+    assert rate_limit.retry_after_seconds(None, default=3) == 3
+    assert rate_limit.retry_after_seconds("garbage", default=3) == 3
@@ -0,0 +1,41 @@
+# test_text_matcher.py
+from text_matcher import PhraseMatcher
+
+def _matcher():
+    m = PhraseMatcher()
+    m.add("signal", "rate", "rate", "rates")
+    m.add("signal", "cut", "cut")
+    m.add("signal", "sec", "sec")
+    m.add("ticker", "BNB", "bnb", "binance coin")
+    return m
+
+def test_whole_words_only():
+    m = _matcher()
+    assert m.match("Separate corporate cuts") == {}
+    assert m.match("Fed holds rate") == {"signal": ["rate"]}
+    assert m.match("SEC, again!") == {"signal": ["sec"]}
+
+def test_only_registered_plurals():
+    m = _matcher()
+    assert m.match("Rates climb") == {"signal": ["rate"]}
+    assert m.match("Budget cuts loom") == {}
+
+def test_multi_word_phrases_and_order():
+    m = _matcher()
+    assert m.match("Binance Coin slides as rate fears grow") == {"signal": ["rate"], "ticker": ["BNB"]}
+
+def test_labels_reported_once():
+    assert _matcher().match("rate rate rates") == {"signal": ["rate"]}
+
+def test_symbols_need_cashtag_or_caps():
+    m = _matcher()
+    assert m.set_symbols(["PEPE", "ai", "Moon", "NEW"], exclude={"new"}) == 2
+    assert m.match("$pepe and MOON pump") == {"ticker": ["PEPE", "MOON"]}
+    assert m.match("pepe and moon pump") == {}
+    assert m.match("NEW listing") == {}
+
+def test_set_symbols_replaces_universe():
+    m = _matcher()
+    m.set_symbols(["PEPE"])
+    m.set_symbols(["WIF"])
+    assert m.match("$PEPE $WIF") == {"ticker": ["WIF"]}
@@ -0,0 +1,31 @@
+# test_watchlist.py
+import pytest
+
+import watchlist
+from token_snapshot import TokenSnapshot
+
+SUI_COIN = "0xA1B2::Coin::MYCOIN"
+
+def test_normalize_keeps_sui_type_names():
+    assert watchlist.normalize(" 0xAbCdEf ") == "0xabcdef"
+    assert watchlist.normalize(SUI_COIN) == "0xa1b2::Coin::MYCOIN"
+    assert watchlist.normalize("So11111111111111111111111111111111111111112") == \
+        "So11111111111111111111111111111111111111112"
+
+@pytest.fixture
+def store(tmp_path):
+    return watchlist.WatchlistStore(str(tmp_path / "wl.json"))
+
+def test_evaluate_uses_each_watch_chain(store):
+    store.add(1, TokenSnapshot(chain="base", contract="0xAB", name="X", price=1.0), 10, 30)
+    store.add(2, TokenSnapshot(chain="ethereum", contract="0xab", name="X", price=1.0), 10, 30)
+    assert store.unique_by_chain() == {"base": ["0xab"], "ethereum": ["0xab"]}
+    moved = TokenSnapshot(chain="base", contract="0xab", name="X", price=1.5)
+    alerts = store.evaluate({("base", "0xab"): moved, ("ethereum", "0xab"): None})
+    assert [(chat, w.chain) for chat, w, _ in alerts] == [(1, "base")]
+
+def test_sui_watch_round_trips(store, tmp_path):
+    store.add(1, TokenSnapshot(chain="sui", contract=SUI_COIN, name="C", price=2.0), 10, 30)
+    assert store.flush()
+    again = watchlist.WatchlistStore(str(tmp_path / "wl.json"))
+    assert again.unique_by_chain() == {"sui": ["0xa1b2::Coin::MYCOIN"]}
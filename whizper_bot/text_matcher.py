@@ -0,0 +1,84 @@
+# text_matcher.py
+"""
+Single-pass phrase matcher for headlines.
+
+Phrases are stored as token tuples in one hash table, so matching a text is
+one tokenize plus, per token, a lookup for each phrase length up to the
+longest phrase: the cost grows with the headline, not with how many phrases
+are registered. Matches are whole words (no "rate" inside "separate"), and
+only the forms registered: plurals that should count are added as phrases
+of their own, so no guessed inflection widens the list.
+
+Besides curated phrases, a bulk symbol set (e.g. every base-token symbol seen
+in Dexscreener pairs) can be swapped in. Those symbols only match as cashtags
+("$PEPE") or all-caps words, since many tickers are ordinary English words.
+"""
+import re
+import threading
+
+_WORD = re.compile(r"[a-z0-9]+")
+_RAW_WORD = re.compile(r"\$?[A-Za-z0-9]+")
+
+def _tokens(text: str) -> list[str]:
+    return _WORD.findall((text or "").lower())
+
+class PhraseMatcher:
+    def __init__(self):
+        self._phrases: dict[tuple, tuple] = {}   # token tuple -> (order, kind, label)
+        self._max_len = 1
+        self._symbols: dict[str, str] = {}       # lowercased symbol -> label
+        self._lock = threading.Lock()
+
+    def add(self, kind: str, label: str, *phrases: str) -> None:
+        """Register phrases that tag a text with (kind, label)."""
+        for phrase in phrases:
+            toks = tuple(_tokens(phrase))
+            if not toks:
+                continue
+            self._phrases.setdefault(toks, (len(self._phrases), kind, label))
+            self._max_len = max(self._max_len, len(toks))
+
+    def set_symbols(self, symbols, min_len: int = 3, exclude=()) -> int:
+        """Replace the bulk ticker set (cashtag / all-caps matching). Returns its size."""
+        skip = {e.lower() for e in exclude}
+        table = {}
+        for sym in symbols:
+            sym = (sym or "").strip()
+            if len(sym) >= min_len and sym.isalnum() and sym.lower() not in skip:
+                table.setdefault(sym.lower(), sym.upper())
+        with self._lock:
+            self._symbols = table
+        return len(table)
+
+    def match(self, text: str, symbol_kind: str = "ticker") -> dict[str, list[str]]:
+        """{kind: [label, ...]} for every hit in text, each label once."""
+        hits: dict[tuple, tuple] = {}
+        toks = _tokens(text)
+        phrases, max_len = self._phrases, self._max_len
+        for i, tok in enumerate(toks):
+            hit = phrases.get((tok,))
+            if hit is not None:
+                hits.setdefault(hit[1:], hit)
+            for n in range(2, max_len + 1):
+                hit = phrases.get(tuple(toks[i:i + n]))
+                if hit is not None:
+                    hits.setdefault(hit[1:], hit)
+
+        symbols = self._symbols
+        if symbols:
+            for raw in _RAW_WORD.findall(text or ""):
+                cashtag = raw.startswith("$")
+                word = raw[1:] if cashtag else raw
+                if cashtag or (word.isupper() and len(word) >= 3):
+                    label = symbols.get(word.lower())
+                    if label is not None:
+                        key = (symbol_kind, label)
+                        hits.setdefault(key, (len(phrases) + len(hits),) + key)
+
+        out: dict[str, list[str]] = {}
+        for order, kind, label in sorted(hits.values()):
+            out.setdefault(kind, []).append(label)
+        return out
+
+    def stats(self) -> dict:
+        return {"phrases": len(self._phrases), "symbols": len(self._symbols)}
@@ -0,0 +1,86 @@
+# token_cache.py
+"""
+In-process TTL + LRU cache for token lookups, with stale-while-revalidate.
+
+Entries are keyed by (chain, contract) and carry two timestamps: one for the
+market fields (price / volume / liquidity, short TTL) and one for the slow
+enrichment fields (holders, authorities, age; long TTL). A stale entry is
+still served for `max_stale` seconds past its market TTL while the caller
+kicks off a refresh in the background.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+FRESH, STALE, MISS = "fresh", "stale", "miss"
+
+class _Entry:
+    __slots__ = ("value", "meta", "market_ts", "meta_ts")
+
+    def __init__(self, value, meta, market_ts, meta_ts):
+        self.value = value
+        self.meta = meta
+        self.market_ts = market_ts
+        self.meta_ts = meta_ts
+
+class TokenCache:
+    def __init__(self, market_ttl: float = 15, meta_ttl: float = 300,
+                 max_stale: float = 120, max_entries: int = 2048):
+        self.market_ttl = market_ttl
+        self.meta_ttl = meta_ttl
+        self.max_stale = max_stale
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counts = {"hits": 0, "stale_hits": 0, "misses": 0, "evictions": 0, "stores": 0}
+
+    def lookup(self, key):
+        """Returns (value, state) where state is FRESH, STALE or MISS."""
+        now = time.monotonic()
+        with self._lock:
+            e = self._entries.get(key)
+            if e is None:
+                self._counts["misses"] += 1
+                return None, MISS
+            age = now - e.market_ts
+            if age <= self.market_ttl:
+                self._entries.move_to_end(key)
+                self._counts["hits"] += 1
+                return e.value, FRESH
+            if age <= self.market_ttl + self.max_stale:
+                self._entries.move_to_end(key)
+                self._counts["stale_hits"] += 1
+                return e.value, STALE
+            self._counts["misses"] += 1
+            return None, MISS
+
+    def meta_for(self, key):
+        """Cached enrichment fields if they are still within meta_ttl, else None."""
+        with self._lock:
+            e = self._entries.get(key)
+            if e is None or e.meta is None or time.monotonic() - e.meta_ts > self.meta_ttl:
+                return None
+            return e.meta
+
+    def store(self, key, value, meta: dict | None = None, meta_fresh: bool = True):
+        """
+        Insert/refresh an entry. `meta_fresh=False` keeps the previous meta
+        timestamp (the caller reused cached meta rather than re-fetching it).
+        """
+        now = time.monotonic()
+        with self._lock:
+            prev = self._entries.pop(key, None)
+            meta_ts = now if (meta_fresh or prev is None) else prev.meta_ts
+            self._entries[key] = _Entry(value, meta, now, meta_ts)
+            self._counts["stores"] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counts["evictions"] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            out = dict(self._counts, size=len(self._entries), max_entries=self.max_entries)
+        served = out["hits"] + out["stale_hits"]
+        total = served + out["misses"]
+        out["hit_rate"] = round(served / total, 3) if total else 0.0
+        return out
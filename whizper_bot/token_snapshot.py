@@ -0,0 +1,155 @@
+# token_snapshot.py
+"""
+TokenSnapshot: the compact, typed result of a token lookup.
+
+Numbers stay numbers (floats/ints, None when unknown) all the way through
+the cache, risk scoring and batch paths; strings like "$1,234" are only made
+by the renderers (Telegram / X / JSON) via the fmt_* helpers below.
+"""
+import enum
+import math
+import time
+from dataclasses import dataclass
+
+class LpStatus(enum.Enum):
+    LOCKED = "🔥"
+    UNLOCKED = "💦"
+    UNKNOWN = "💀"
+    NO_DATA = "☠️"   # fallback sources that can't see LP at all
+
+    @classmethod
+    def from_locked(cls, locked) -> "LpStatus":
+        if locked is None:
+            return cls.UNKNOWN
+        return cls.LOCKED if locked else cls.UNLOCKED
+
+    @classmethod
+    def from_icon(cls, icon) -> "LpStatus":
+        try:
+            return cls(icon)
+        except ValueError:
+            return cls.UNKNOWN
+
+# enrichment fields that live on the slow (meta) cache TTL
+META_FIELDS = ("holders", "top_holder_pct", "mint_auth", "freeze_auth", "created_ts")
+
+@dataclass(slots=True)
+class TokenSnapshot:
+    chain: str | None
+    contract: str
+    name: str = "Unknown"
+    price: float | None = None
+    volume_24h: float | None = None
+    volume_1h: float | None = None
+    liquidity: float | None = None
+    fdv: float | None = None
+    lp: LpStatus = LpStatus.UNKNOWN
+    holders: int | None = None
+    top_holder_pct: float | None = None
+    mint_auth: bool | None = None
+    freeze_auth: bool | None = None
+    created_ts: float | None = None   # unix seconds
+    dex_link: str = ""
+    link_web: str = ""
+    link_x: str = ""
+    link_tg: str = ""
+    whiz_note: str = ""
+    pending: tuple = ()               # enrichment fields that missed their deadline
+
+    def meta(self) -> dict:
+        return {k: getattr(self, k) for k in META_FIELDS}
+
+    def apply_meta(self, meta: dict):
+        for k, v in meta.items():
+            setattr(self, k, v)
+
+    def to_report_dict(self) -> dict:
+        """Legacy JSON shape (pre-formatted strings), as /analyze has always returned it."""
+        out = {
+            "name": self.name,
+            "price": fmt_price(self.price, "Unknown"),
+            "volume": fmt_money(self.volume_24h, "Unknown"),
+            "volume1h": fmt_money(self.volume_1h, "N/A"),
+            "liquidity": fmt_money(self.liquidity, "Unknown"),
+            "fdv": fmt_money(self.fdv, "Unknown"),
+            "holders": str(self.holders) if self.holders is not None else "N/A",
+            "lp_burned": self.lp.value,
+            "dex_link": self.dex_link,
+            "links": {"web": self.link_web, "x": self.link_x, "tg": self.link_tg},
+            "whiz_note": self.whiz_note,
+            "chain": self.chain,
+        }
+        if self.top_holder_pct is not None:
+            out["top_holder_pct"] = self.top_holder_pct
+        if self.mint_auth is not None:
+            out["mint_auth"] = self.mint_auth
+        if self.freeze_auth is not None:
+            out["freeze_auth"] = self.freeze_auth
+        age = fmt_age(self.created_ts)
+        if age:
+            out["age"] = age
+        if self.pending:
+            out["pending"] = list(self.pending)
+        return out
+
+# ---------- parsing / formatting helpers ----------
+
+def to_num(x) -> float | None:
+    """Float from a number or a loosely formatted string ("$1,234"); None if not numeric."""
+    if x is None or isinstance(x, bool):
+        return None
+    if isinstance(x, (int, float)):
+        return float(x)
+    try:
+        return float(str(x).replace("$", "").replace(",", "").strip())
+    except ValueError:
+        return None
+
+def to_int(x) -> int | None:
+    f = to_num(x)
+    return int(f) if f is not None else None
+
+def address_key(contract: str) -> str:
+    """
+    Canonical form of a contract for matching. 0x hex is case-insensitive and
+    gets lowercased; a Sui coin type's module and struct names (after the
+    first "::") and base58 mints are case-sensitive and kept as they are.
+    """
+    contract = (contract or "").strip()
+    if contract[:2].lower() != "0x":
+        return contract
+    addr, sep, rest = contract.partition("::")
+    return addr.lower() + sep + rest
+
+def fmt_money(x: float | None, missing: str = "N/A") -> str:
+    if x is None:
+        return missing
+    return f"${x:,.0f}" if abs(x) >= 1000 else f"${x:,.2f}"
+
+def fmt_price(x: float | None, missing: str = "N/A") -> str:
+    """Like fmt_money, but keeps ~4 significant digits for sub-dollar prices."""
+    if x is None:
+        return missing
+    if x == 0 or abs(x) >= 1:
+        return fmt_money(x, missing)
+    decimals = min(12, 3 - math.floor(math.log10(abs(x))))
+    return "$" + f"{x:.{decimals}f}".rstrip("0").rstrip(".")
+
+def fmt_age(ts: float | None) -> str | None:
+    if not ts: return None
+    try:
+        ts = float(ts)
+        if ts > 10**12: ts = ts/1000.0
+        delta = max(0, int(time.time()-ts))
+        years, rem = divmod(delta, 365*86400)
+        months, rem = divmod(rem, 30*86400)
+        weeks, rem = divmod(rem, 7*86400)
+        days, _ = divmod(rem, 86400)
+        parts=[]
+        if years: parts.append(f"{years}y")
+        if months: parts.append(f"{months}mo")
+        if weeks: parts.append(f"{weeks}w")
+        if days and not parts: parts.append(f"{days}d")
+        return " ".join(parts) or "0d"
+    except Exception:
+        return None
@@ -0,0 +1,198 @@
+# watchlist.py
+"""
+Per-chat token watchlists with threshold alerts.
+
+Each watch keeps a baseline (price, liquidity, LP status). An alert fires
+when a poll crosses a threshold against that baseline, after which the
+baseline moves to the current value, so a token sitting past its threshold
+does not alert again until it moves another full step.
+
+Polling is driven from outside (whizper_handler's job): every watched
+address across all chats is merged and deduped per chain first, so the cost
+scales with unique tokens, not chats x tokens. State persists to a JSON
+file; edits only mark it dirty and `flush()` does the (blocking) write, so
+callers on an event loop run it in a thread.
+"""
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+
+from config import CONFIG
+from token_snapshot import LpStatus, address_key, fmt_money, fmt_price
+
+@dataclass(slots=True)
+class Watch:
+    contract: str
+    chain: str | None
+    name: str
+    price_pct: float
+    liq_drop_pct: float
+    base_price: float | None = None
+    base_liq: float | None = None
+    last_lp: str | None = None
+    added_ts: float = 0.0
+
+def normalize(contract: str) -> str:
+    # hex lowercased, Sui module/struct names left alone (see address_key)
+    return address_key(contract)
+
+class WatchlistStore:
+    def __init__(self, path: str, max_per_chat: int = 25):
+        self.path = path
+        self.max_per_chat = max_per_chat
+        self._chats: dict[int, dict[str, Watch]] = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._dirty = False
+        self._load()
+
+    # ---------- persistence ----------
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+            self._chats = {
+                int(chat_id): {w["contract"]: Watch(**w) for w in watches}
+                for chat_id, watches in raw.items()
+            }
+        except Exception as e:
+            print("watchlist load error:", e)
+
+    def _save(self):
+        # caller holds self._lock; the file write waits for flush()
+        self._dirty = True
+
+    def flush(self) -> bool:
+        """Write pending changes to disk. Blocking: use asyncio.to_thread on a loop."""
+        if not self.path:
+            return False
+        # snapshot and write under one lock, so an older snapshot never lands last
+        with self._write_lock:
+            with self._lock:
+                if not self._dirty:
+                    return False
+                raw = {str(c): [asdict(w) for w in ws.values()] for c, ws in self._chats.items() if ws}
+                self._dirty = False
+            tmp = f"{self.path}.tmp"
+            try:
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(raw, f)
+                os.replace(tmp, self.path)
+            except Exception as e:
+                print("watchlist save error:", e)
+                with self._lock:
+                    self._dirty = True
+                return False
+        return True
+
+    # ---------- edits ----------
+
+    def add(self, chat_id: int, snap, price_pct: float, liq_drop_pct: float) -> str | None:
+        """Watch snap's token in chat_id. Returns an error string, or None on success."""
+        contract = normalize(snap.contract)
+        with self._lock:
+            watches = self._chats.setdefault(chat_id, {})
+            if contract not in watches and len(watches) >= self.max_per_chat:
+                return f"This chat already watches {self.max_per_chat} tokens. /unwatch one first."
+            watches[contract] = Watch(
+                contract=contract, chain=snap.chain, name=snap.name,
+                price_pct=price_pct, liq_drop_pct=liq_drop_pct,
+                base_price=snap.price, base_liq=snap.liquidity,
+                last_lp=snap.lp.value, added_ts=time.time(),
+            )
+            self._save()
+        return None
+
+    def remove(self, chat_id: int, contract: str | None = None) -> int:
+        """Drop one watch, or every watch in the chat when contract is None. Returns how many went."""
+        with self._lock:
+            watches = self._chats.get(chat_id) or {}
+            if contract is None:
+                n = len(watches)
+                watches.clear()
+            else:
+                n = 1 if watches.pop(normalize(contract), None) else 0
+            if n:
+                self._save()
+        return n
+
+    def for_chat(self, chat_id: int) -> list[Watch]:
+        with self._lock:
+            return list((self._chats.get(chat_id) or {}).values())
+
+    def unique_by_chain(self) -> dict[str | None, list[str]]:
+        """Every watched address across all chats, deduped and grouped by the chain it was watched on."""
+        out: dict[str | None, dict] = {}
+        with self._lock:
+            for ws in self._chats.values():
+                for c, w in ws.items():
+                    out.setdefault(w.chain, {})[c] = None
+        return {chain: list(cs) for chain, cs in out.items()}
+
+    # ---------- alerts ----------
+
+    def evaluate(self, results: dict) -> list[tuple[int, Watch, list[str]]]:
+        """
+        Compare polled snapshots ({(chain, address): TokenSnapshot|None})
+        against each watch. Returns (chat_id, watch, [reason, ...]) for every
+        crossing and moves the crossed baselines.
+        """
+        alerts = []
+        with self._lock:
+            for chat_id, watches in self._chats.items():
+                for contract, w in watches.items():
+                    snap = results.get((w.chain, contract))
+                    if snap is None:
+                        continue
+                    reasons = _crossings(w, snap)
+                    if reasons:
+                        alerts.append((chat_id, w, reasons))
+            if alerts:
+                self._save()
+        return alerts
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "chats": sum(1 for ws in self._chats.values() if ws),
+                "watches": sum(len(ws) for ws in self._chats.values()),
+                "unique_tokens": len({c for ws in self._chats.values() for c in ws}),
+            }
+
+def _crossings(w: Watch, snap) -> list[str]:
+    reasons = []
+
+    if snap.price and w.base_price:
+        move = (snap.price / w.base_price - 1) * 100
+        if abs(move) >= w.price_pct:
+            arrow = "🚀" if move > 0 else "🩸"
+            reasons.append(f"{arrow} Price {move:+.1f}% → `{fmt_price(snap.price)}`")
+            w.base_price = snap.price
+    elif snap.price:
+        w.base_price = snap.price
+
+    if snap.liquidity is not None and w.base_liq:
+        drop = (1 - snap.liquidity / w.base_liq) * 100
+        if drop >= w.liq_drop_pct:
+            reasons.append(f"💧 Liquidity −{drop:.1f}% → `{fmt_money(snap.liquidity)}`")
+        # liquidity only alerts on the way down; recovery just rebases quietly
+        if drop >= w.liq_drop_pct or snap.liquidity > w.base_liq:
+            w.base_liq = snap.liquidity
+    elif snap.liquidity:
+        w.base_liq = snap.liquidity
+
+    lp = snap.lp.value
+    if w.last_lp == LpStatus.LOCKED.value and lp != w.last_lp and snap.lp is not LpStatus.NO_DATA:
+        reasons.append(f"🔓 LP no longer locked ({lp})")
+    if snap.lp is not LpStatus.NO_DATA:
+        w.last_lp = lp
+
+    return reasons
+
+_cfg = CONFIG["WATCHLIST"]
+store = WatchlistStore(_cfg["path"], max_per_chat=_cfg["max_per_chat"])
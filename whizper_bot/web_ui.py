@@ -1,12 +1,36 @@
 # web_ui.py
+import startup_profile
+startup_profile.enable()  # WHIZPER_PROFILE_STARTUP=1 (uvicorn owns argv): time every import below
+
+import asyncio
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from price_fetcher import fetch_token_data
+from price_fetcher import (
+    fetch_token_data_async,
+    fetch_token_data_many_async,
+    risk_badge_from_data,
+    token_cache_stats,
+)
 from config import CONFIG
+import http_client
+import circuit
+import movers
+import news_monitor
+import rate_limit
+import risk
+import snapshot_store
+from chain_fallback import fallback_stats
 
 app = FastAPI(title="Whizper HQ 🐸")
 
+@app.on_event("startup")
+async def _report_startup():
+    # uvicorn owns main(); its startup hook is our equivalent
+    startup_profile.report("web_ui")
+
+MAX_BATCH_ADDRESSES = 150
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # tighten to your domains if needed
@@ -15,17 +39,33 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+def _report_json(snap) -> dict:
+    return dict(snap.to_report_dict(), risk=risk_badge_from_data(snap))
+
 @app.get("/")
 async def root():
     return {
         "message": "🐸 Welcome to Whizper HQ.",
         "how_to": "Hit /analyze?chain=<solana|ethereum|base|sui|abstract>&address=<contract>",
+        "batch": "Hit /analyze/batch?addresses=<ca1,ca2,...>[&chain=<chain>]",
+        "history": "Hit /history?chain=<chain>&address=<contract>[&hours=24]",
         "vibes": "Ribbits, croaks, and market jokes."
     }
 
 @app.get("/croak")
 async def croak():
-    return {"croak": "ok", "env": CONFIG.get("ENVIRONMENT", "unknown")}
+    return {
+        "croak": "ok",
+        "env": CONFIG.get("ENVIRONMENT", "unknown"),
+        "breakers": circuit.snapshot(),
+        "rate_limits": rate_limit.snapshot(),
+        "http_pools": http_client.pool_stats(),
+        "token_cache": token_cache_stats(),
+        "fallbacks": fallback_stats(),
+        "movers": movers.stats(),
+        "snapshots": snapshot_store.stats(),
+        "news": news_monitor.news_stats(),
+    }
 
 @app.get("/ribbit")
 async def ribbit(echo: str | None = None):
@@ -39,13 +79,48 @@ async def analyze(chain: str, address: str):
             status_code=400,
             detail=f"Unsupported chain '{chain}'. Try one of: {', '.join(sorted(supported))}."
         )
-    data = fetch_token_data(chain, address)
-    if not data:
+    snap = await fetch_token_data_async(chain, address)
+    if not snap:
         raise HTTPException(
             status_code=404,
             detail="Couldn’t croak any intel for that contract. Try another."
         )
-    return data
+    return _report_json(snap)
+
+@app.get("/analyze/batch")
+async def analyze_batch(addresses: str, chain: str | None = None):
+    supported = set(CONFIG.get("SUPPORTED_CHAINS", []))
+    if chain and chain not in supported:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported chain '{chain}'. Try one of: {', '.join(sorted(supported))}."
+        )
+    wanted = [a.strip() for a in addresses.split(",") if a.strip()]
+    if not wanted:
+        raise HTTPException(status_code=400, detail="Give me at least one address, comma-separated.")
+    if len(wanted) > MAX_BATCH_ADDRESSES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many addresses ({len(wanted)}). Max {MAX_BATCH_ADDRESSES} per call."
+        )
+    results = await fetch_token_data_many_async(wanted, chain)
+    found = [(a, s) for a, s in results.items() if s]
+    badges, scores = risk.score_snapshots([s for _, s in found])
+    reports = {}
+    for (a, s), badge, score in zip(found, badges, scores.tolist()):
+        reports[a] = dict(s.to_report_dict(), risk=badge, risk_score=round(score, 4))
+    return {
+        "results": reports,
+        "ranked": sorted(reports, key=lambda a: reports[a]["risk_score"]),  # safest first
+        "missing": [a for a, s in results.items() if not s],
+    }
+
+@app.get("/history")
+async def history(chain: str, address: str, hours: float = 24):
+    if not 0 < hours <= 24 * 30:
+        raise HTTPException(status_code=400, detail="hours must be between 0 and 720.")
+    rows = await asyncio.to_thread(snapshot_store.history, chain, address, hours)
+    return {"chain": chain, "address": address, "hours": hours, "snapshots": rows}
 
 # ───────── frog-flavored 404 ───────── #
 @app.exception_handler(404)
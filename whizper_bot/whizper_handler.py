@@ -1,8 +1,15 @@
 # whizper_handler.py
 from datetime import time
-import hashlib
+import asyncio
+import re
 
+from config import CONFIG
 from content import pick_wisdom
+import movers
+import rate_limit
+import risk
+import snapshot_store
+import watchlist
 
 from telegram import (
     Update,
@@ -19,12 +26,17 @@ from telegram.ext import (
 )
 
 from price_fetcher import (
-    fetch_token_data,
+    fetch_token_data_any_async,
+    fetch_token_data_many_async,
     build_daily_report_text,
     risk_badge_from_data,
 )
 
+from token_snapshot import TokenSnapshot, fmt_age, fmt_money, fmt_price
+
 from news_monitor import (
+    ingest_news,
+    news_stats,
     summarize_market_news,
     format_markdown_report,   # verbose formatter (used in daily croak)
     format_compact_report,    # compact formatter (used in /news + hourly pulse)
@@ -47,66 +59,103 @@ def _looks_like_contract(s: str) -> bool:
         return True
     return False
 
-def _render_report(contract: str, chain: str | None, data: dict) -> str:
+MAX_MULTI_CA = 30
+
+def _extract_contracts(msg: str) -> list[str]:
+    """All CAs in a multi-CA paste (whitespace/comma separated); [] if anything else is in there."""
+    parts = [p for p in re.split(r"[\s,;]+", msg or "") if p]
+    if len(parts) < 2 or not all(_looks_like_contract(p) for p in parts):
+        return []
+    return list(dict.fromkeys(parts))[:MAX_MULTI_CA]
+
+def _fmt_ago(seconds: float) -> str:
+    seconds = max(0, int(seconds))
+    if seconds < 3600:
+        return f"{max(1, seconds // 60)}m"
+    if seconds < 86400:
+        return f"{seconds // 3600}h"
+    return f"{seconds // 86400}d"
+
+def _render_report(contract: str, chain: str | None, snap: TokenSnapshot,
+                   since: tuple[float, float] | None = None) -> str:
     # primary lines
     core = (
         f"🔩 *Whizper Report* — `{contract}`\n\n"
-        f"*{data.get('name','Unknown')}*{(' on *' + chain.upper() + '*') if chain else ''}\n"
-        f"💸 Price: `${data.get('price','N/A')}`\n"
-        f"📊 24h Volume: `${data.get('volume','N/A')}`"
+        f"*{snap.name}*{(' on *' + chain.upper() + '*') if chain else ''}\n"
+        f"💸 Price: `{fmt_price(snap.price)}`\n"
+        f"📊 24h Volume: `{fmt_money(snap.volume_24h)}`"
     )
 
     # optional 1h volume
-    v1h = data.get("volume1h")
-    if v1h and str(v1h).lower() not in ("n/a", "unknown", "none", "0"):
-        core += f" | 1h: `${v1h}`"
+    if snap.volume_1h:
+        core += f" | 1h: `{fmt_money(snap.volume_1h)}`"
 
     # liquidity + lp
-    core += f"\n💧 Liquidity: `${data.get('liquidity','N/A')}` | LP: {data.get('lp_burned','💀')}"
+    core += f"\n💧 Liquidity: `{fmt_money(snap.liquidity)}` | LP: {snap.lp.value}"
 
     # fdv/mcap style
-    core += f"\n📈 FDV: `${data.get('fdv','N/A')}`"
-
-    # holders + top holder % (if present)
-    holders = data.get("holders")
-    top_pct = data.get("top_holder_pct")
-    if holders and str(holders).lower() not in ("n/a", "unknown", "none"):
-        extra = f"{holders}"
-        if isinstance(top_pct, (int, float)):
-            extra += f" | Top: {top_pct:.2f}%"
+    core += f"\n📈 FDV: `{fmt_money(snap.fdv)}`"
+
+    # price move versus the previous lookup we stored
+    if since:
+        core += f"\n🕰 Since last check ({_fmt_ago(since[1])} ago): `{since[0]:+.1f}%`"
+
+    # holders + top holder % (if present); Solscan fields that missed the deadline show as pending
+    pending = set(snap.pending)
+    if "holders" in pending:
+        core += "\n👥 Holders: ⏳ pending"
+    elif snap.holders:
+        extra = f"{snap.holders:,}"
+        if snap.top_holder_pct is not None:
+            extra += f" | Top: {snap.top_holder_pct:.2f}%"
+        elif "top_holder_pct" in pending:
+            extra += " | Top: ⏳"
         core += f"\n👥 Holders: {extra}"
 
     # mint/freeze authority flags (Solana)
-    mint_auth = data.get("mint_auth")
-    freeze_auth = data.get("freeze_auth")
-    if mint_auth is not None or freeze_auth is not None:
-        mint_str = "♥" if mint_auth else "♡"
-        freeze_str = "❄️" if freeze_auth else "—"
+    if "mint_auth" in pending:
+        core += "\n🔐 Mint/Freeze: ⏳ pending"
+    elif snap.mint_auth is not None or snap.freeze_auth is not None:
+        mint_str = "♥" if snap.mint_auth else "♡"
+        freeze_str = "❄️" if snap.freeze_auth else "—"
         core += f"\n🔐 Mint: {mint_str}  |  Freeze: {freeze_str}"
 
     # age (best effort)
-    age = data.get("age")
+    age = fmt_age(snap.created_ts)
     if age:
         core += f"\n⏳ Age: {age}"
+    elif "created_ts" in pending:
+        core += "\n⏳ Age: pending"
 
     # risk
-    core += f"\n\n⚠️ Risk: {risk_badge_from_data(data)}\n"
+    core += f"\n\n⚠️ Risk: {risk_badge_from_data(snap)}\n"
 
     # quick links (X / TG / WEB) if any
-    links = data.get("links") or {}
     parts = []
-    if links.get("x"): parts.append(f"[X]({links['x']})")
-    if links.get("tg"): parts.append(f"[TG]({links['tg']})")
-    if links.get("web"): parts.append(f"[WEB]({links['web']})")
+    if snap.link_x: parts.append(f"[X]({snap.link_x})")
+    if snap.link_tg: parts.append(f"[TG]({snap.link_tg})")
+    if snap.link_web: parts.append(f"[WEB]({snap.link_web})")
     if parts:
         core += "\n🔗 " + " • ".join(parts)
 
     # note/wisdom
-    core += f"\n\n🐸 {data.get('whiz_note') or pick_wisdom()}\n\n"
-    return core + (data.get("dex_link") or "")
-
-def _hash(text: str) -> str:
-    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+    core += f"\n\n🐸 {snap.whiz_note or pick_wisdom()}\n\n"
+    return core + (snap.dex_link or "")
+
+def _render_multi_report(results: dict) -> str:
+    lines = [f"🔩 *Whizper Batch* — {len(results)} contracts\n"]
+    badges = iter(risk.score_snapshots([s for s in results.values() if s])[0])
+    for ca, snap in results.items():
+        short = f"{ca[:6]}…{ca[-4:]}"
+        if not snap:
+            lines.append(f"❌ `{short}` — no Dexscreener intel")
+            continue
+        lines.append(
+            f"*{snap.name}* ({(snap.chain or '').upper()}) `{short}`\n"
+            f"   💸 {fmt_price(snap.price)} | 💧 {fmt_money(snap.liquidity)} | "
+            f"📊 {fmt_money(snap.volume_24h)} | LP {snap.lp.value} | ⚠️ {next(badges)}"
+        )
+    return "\n".join(lines)
 
 def _tg_fit(text: str, max_len: int = 4096) -> str:
     if not isinstance(text, str):
@@ -128,32 +177,129 @@ async def handle_text(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await _track_chat_event(update, context)
 
     msg = (update.message.text or "").strip()
+    many = _extract_contracts(msg)
+    if many:
+        results = await fetch_token_data_many_async(many)
+        await update.message.reply_text(
+            _tg_fit(_render_multi_report(results)),
+            parse_mode="Markdown",
+            disable_web_page_preview=True,
+        )
+        return
     if not _looks_like_contract(msg):
         return
 
-    data = (
-        fetch_token_data("solana",   msg) or
-        fetch_token_data("sui",      msg) or
-        fetch_token_data("base",     msg) or
-        fetch_token_data("ethereum", msg)
-    )
-    if not data:
+    chain, snap = await fetch_token_data_any_async(msg)
+    if not snap:
         await update.message.reply_text("❌ Couldn’t fetch that one. Might be too new or rugged. 🐸")
         return
 
-    chain_hint = None
-    dl = (data.get("dex_link") or "").lower()
-    for ch in ("solana", "sui", "base", "ethereum"):
-        if f"/{ch}/" in dl:
-            chain_hint = ch
-            break
-
+    since = await asyncio.to_thread(snapshot_store.since_last_check, chain, msg, snap.price)
     await update.message.reply_text(
-        _render_report(msg, chain_hint, data),
+        _render_report(msg, chain, snap, since),
         parse_mode="Markdown",
         disable_web_page_preview=False,
     )
 
+# ───────── watchlist ───────── #
+
+def _pct_arg(args: list, i: int, default: float) -> float | None:
+    if len(args) <= i:
+        return default
+    try:
+        v = float(args[i].rstrip("%"))
+    except ValueError:
+        return None
+    return v if v > 0 else None
+
+async def cmd_watch(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    await _track_chat_event(update, context)
+    args = context.args or []
+    cfg = CONFIG["WATCHLIST"]
+    price_pct = _pct_arg(args, 1, cfg["price_pct"])
+    liq_pct = _pct_arg(args, 2, cfg["liq_drop_pct"])
+    if not args or not _looks_like_contract(args[0]) or price_pct is None or liq_pct is None:
+        await update.message.reply_text(
+            "Usage: `/watch <CA> [price%] [liquidity drop%]`\n"
+            f"Defaults: ±{cfg['price_pct']:g}% price, −{cfg['liq_drop_pct']:g}% liquidity, LP unlocks.",
+            parse_mode="Markdown",
+        )
+        return
+
+    chain, snap = await fetch_token_data_any_async(args[0])
+    if not snap:
+        await update.message.reply_text("❌ Couldn’t fetch that one, so I can’t watch it. 🐸")
+        return
+    err = watchlist.store.add(update.effective_chat.id, snap, price_pct, liq_pct)
+    if err:
+        await update.message.reply_text(f"⚠️ {err}")
+        return
+    await asyncio.to_thread(watchlist.store.flush)
+    await update.message.reply_text(
+        f"👀 Watching *{snap.name}* ({(chain or '').upper()}) at `{fmt_price(snap.price)}`\n"
+        f"Alerts: ±{price_pct:g}% price • −{liq_pct:g}% liquidity • LP unlock",
+        parse_mode="Markdown",
+    )
+
+async def cmd_unwatch(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    args = context.args or []
+    if not args:
+        await update.message.reply_text("Usage: `/unwatch <CA>` or `/unwatch all`", parse_mode="Markdown")
+        return
+    target = None if args[0].lower() == "all" else args[0]
+    n = watchlist.store.remove(update.effective_chat.id, target)
+    if n:
+        await asyncio.to_thread(watchlist.store.flush)
+    await update.message.reply_text(f"🫡 Stopped watching {n} token{'s' if n != 1 else ''}." if n
+                                    else "Not watching that one here.")
+
+async def cmd_watchlist(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    watches = watchlist.store.for_chat(update.effective_chat.id)
+    if not watches:
+        await update.message.reply_text("Nothing on the watchlist. Try `/watch <CA>`.", parse_mode="Markdown")
+        return
+    lines = [f"👀 *Watchlist* — {len(watches)} tokens\n"]
+    for w in watches:
+        lines.append(
+            f"*{w.name}* ({(w.chain or '').upper()}) `{w.contract[:6]}…{w.contract[-4:]}`\n"
+            f"   base `{fmt_price(w.base_price)}` | ±{w.price_pct:g}% | liq −{w.liq_drop_pct:g}%"
+        )
+    await update.message.reply_text(_tg_fit("\n".join(lines)), parse_mode="Markdown")
+
+async def watchlist_job(context: ContextTypes.DEFAULT_TYPE):
+    by_chain = watchlist.store.unique_by_chain()
+    if not by_chain:
+        return
+    with rate_limit.lane(rate_limit.BACKGROUND):
+        # one bulk poll per chain for every chat: 30 addresses per Dexscreener call,
+        # priced on the chain each token was watched on
+        polls = await asyncio.gather(
+            *(fetch_token_data_many_async(addrs, chain=chain) for chain, addrs in by_chain.items()),
+            return_exceptions=True,
+        )
+    results = {}
+    for chain, res in zip(by_chain, polls):
+        if isinstance(res, Exception):
+            print(f"watchlist poll error ({chain}):", res)
+            continue
+        results.update(((chain, addr), snap) for addr, snap in res.items())
+
+    alerts = watchlist.store.evaluate(results)
+    if alerts:
+        await asyncio.to_thread(watchlist.store.flush)
+    for chat_id, w, reasons in alerts:
+        contract = w.contract
+        snap = results[(w.chain, contract)]
+        text = (
+            f"🚨 *{snap.name}* ({(snap.chain or '').upper()}) `{contract[:6]}…{contract[-4:]}`\n"
+            + "\n".join(reasons)
+            + (f"\n{snap.dex_link}" if snap.dex_link else "")
+        )
+        try:
+            await context.bot.send_message(chat_id=chat_id, text=_tg_fit(text), parse_mode="Markdown")
+        except Exception as e:
+            print(f"watchlist alert error ({chat_id}):", e)
+
 # ───────── join msg ───────── #
 
 async def _on_my_chat_member(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -169,15 +315,17 @@ async def _on_my_chat_member(update: Update, context: ContextTypes.DEFAULT_TYPE)
 # ───────── daily jobs ───────── #
 
 async def daily_analyst_job(context: ContextTypes.DEFAULT_TYPE):
-    try:
-        croak = build_daily_report_text()
-        news_summary = summarize_market_news(hours_back=24, min_abs_sentiment=0.25, max_headlines=8)
-        news_trends = fetch_trends(["bitcoin", "ethereum", "solana"], timeframe="now 7-d")
-        news_block = format_markdown_report(news_summary, news_trends, title="📰 Daily News Highlights")
-        combined = _tg_fit(f"{croak}\n\n{news_block}")
-    except Exception as e:
-        print("Daily build error:", e)
-        combined = _tg_fit(build_daily_report_text())
+    # scheduled work queues behind interactive lookups for upstream rate limits
+    with rate_limit.lane(rate_limit.BACKGROUND):
+        try:
+            croak = await asyncio.to_thread(build_daily_report_text)
+            news_summary = summarize_market_news(hours_back=24, min_abs_sentiment=0.25, max_headlines=8)
+            news_trends = await asyncio.to_thread(fetch_trends, ["bitcoin", "ethereum", "solana"], timeframe="now 7-d")
+            news_block = format_markdown_report(news_summary, news_trends, title="📰 Daily News Highlights")
+            combined = _tg_fit(f"{croak}\n\n{news_block}")
+        except Exception as e:
+            print("Daily build error:", e)
+            combined = _tg_fit(await asyncio.to_thread(build_daily_report_text))
 
     for chat_id in list(context.bot_data.get("groups", set())):
         try:
@@ -185,6 +333,23 @@ async def daily_analyst_job(context: ContextTypes.DEFAULT_TYPE):
         except Exception as e:
             print(f"Daily report error ({chat_id}):", e)
 
+async def movers_refresh_job(context: ContextTypes.DEFAULT_TYPE):
+    # keeps the movers store warm so /movers, /daily and the X croak read it instantly
+    with rate_limit.lane(rate_limit.BACKGROUND):
+        await asyncio.to_thread(movers.engine.refresh)
+
+async def news_ingest_job(context: ContextTypes.DEFAULT_TYPE):
+    # the only place this process crawls feeds; /news and the news jobs read the store
+    with rate_limit.lane(rate_limit.BACKGROUND):
+        try:
+            added = await asyncio.to_thread(ingest_news)
+        except Exception as e:
+            print("news ingest error:", e)
+            return
+        st = await asyncio.to_thread(news_stats)
+    print(f"news ingest: +{added} items | store {st['store']} | "
+          f"sentiment hit rate {st['sentiment'].get('hit_rate')} | fetch cpu {st['fetch_cpu_ms']}")
+
 async def startup_announce(context: ContextTypes.DEFAULT_TYPE):
     for chat_id in list(context.bot_data.get("groups", set())):
         try:
@@ -212,7 +377,10 @@ async def cmd_help(update: Update, context: ContextTypes.DEFAULT_TYPE):
         "ℹ️ *About Whizper the Robo-Frog*\n\n"
         "• `/news` → Compact market snapshot\n"
         "• `/daily` → Daily croak on demand\n"
+        "• `/movers [1h|6h|24h]` → Top gainers/losers right now\n"
+        "• `/watch <CA> [price%] [liq drop%]` → Alerts on big moves, `/unwatch`, `/watchlist`\n"
         "• Drop any CA (Solana/EVM/Sui/Base) for a token report\n"
+        "• Drop several CAs (space/comma separated) for a batch table\n"
         "• Auto jobs: daily croak 15:00 UTC, hourly sentiment pulse\n"
     )
     keyboard = [[InlineKeyboardButton("⬅️ Go Back", callback_data="go_back")]]
@@ -226,7 +394,7 @@ async def cmd_news(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await _track_chat_event(update, context)
     try:
         summary = summarize_market_news(hours_back=12, min_abs_sentiment=0.25, max_headlines=6)
-        trends = fetch_trends(["bitcoin", "ethereum", "solana"], timeframe="now 7-d") or {}
+        trends = await asyncio.to_thread(fetch_trends, ["bitcoin", "ethereum", "solana"], timeframe="now 7-d") or {}
         report = format_compact_report(
             summary, trends,
             title="📰 Market Movers",
@@ -260,13 +428,31 @@ async def button_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await query.edit_message_text(start_msg, parse_mode="Markdown")
 
 async def cmd_daily(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    report = _tg_fit(build_daily_report_text())
+    # served from the shared daily snapshot; only a stale one touches upstreams
+    report = _tg_fit(await asyncio.to_thread(build_daily_report_text))
     await update.message.reply_text(report, parse_mode="Markdown")
 
+async def cmd_movers(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    await _track_chat_event(update, context)
+    window = movers.window_key(context.args[0] if context.args else "24h")
+    if window not in movers.engine.windows:
+        await update.message.reply_text("Usage: `/movers [1h|6h|24h]`", parse_mode="Markdown")
+        return
+    gainers, losers = await asyncio.to_thread(movers.top_movers, window, 5)
+    if not gainers and not losers:
+        await update.message.reply_text("🐸 No movers yet. The pond is still filling up.")
+        return
+    label = window[1:] + "h" if window.startswith("h") else window
+    lines = [f"🐸 *Movers ({label})*", "", "🚀 *Top Gainers*"]
+    lines += [f"• {g}" for g in gainers] or ["• —"]
+    lines += ["", "💀 *Top Losers*"]
+    lines += [f"• {l}" for l in losers] or ["• —"]
+    await update.message.reply_text(_tg_fit("\n".join(lines)), parse_mode="Markdown")
+
 async def hourly_news_job(context: ContextTypes.DEFAULT_TYPE):
     try:
         summary = summarize_market_news(hours_back=2, min_abs_sentiment=0.30, max_headlines=5)
-        trends = fetch_trends(["bitcoin", "ethereum", "solana"], timeframe="now 1-d")
+        trends = await asyncio.to_thread(fetch_trends, ["bitcoin", "ethereum", "solana"], timeframe="now 1-d")
         report = format_compact_report(
             summary, trends,
             title="🗞 Hourly Sentiment Pulse",
@@ -280,8 +466,10 @@ async def hourly_news_job(context: ContextTypes.DEFAULT_TYPE):
         print("hourly_news_job build error:", e)
         return
 
+    # keyed on the headlines actually shown: the same pulse is never re-sent,
+    # however many unselected headlines landed in the store meanwhile
     sent_cache = context.bot_data.setdefault("hourly_news_hashes", {})
-    report_sig = _hash(report)
+    report_sig = tuple(it.get("link") or it.get("title") for it in summary.get("items", [])[:5])
 
     for chat_id in list(context.bot_data.get("groups", set())):
         if sent_cache.get(chat_id) == report_sig:
@@ -306,9 +494,19 @@ def register_handlers(app):
     app.add_handler(CommandHandler("help", cmd_help))
     app.add_handler(CommandHandler("news", cmd_news))
     app.add_handler(CommandHandler("daily", cmd_daily))
+    app.add_handler(CommandHandler("movers", cmd_movers))
+    app.add_handler(CommandHandler("watch", cmd_watch))
+    app.add_handler(CommandHandler("unwatch", cmd_unwatch))
+    app.add_handler(CommandHandler("watchlist", cmd_watchlist))
     app.add_handler(CallbackQueryHandler(button_handler))
     app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_text))
 
     app.job_queue.run_daily(daily_analyst_job, time=time(hour=15, minute=0), name="daily_whizdom")
     app.job_queue.run_once(startup_announce, when=5)
+    app.job_queue.run_repeating(movers_refresh_job, interval=CONFIG["MOVERS"]["refresh_every"],
+                                first=1, name="movers_refresh")
+    app.job_queue.run_repeating(watchlist_job, interval=CONFIG["WATCHLIST"]["poll_every"],
+                                first=30, name="watchlist")
+    app.job_queue.run_repeating(news_ingest_job, interval=CONFIG["NEWS_INGEST_EVERY"],
+                                first=1, name="news_ingest")
     app.job_queue.run_repeating(hourly_news_job, interval=3600, first=300, name="hourly_news")
@@ -1,13 +1,15 @@
 # x_bot.py
+import startup_profile
+startup_profile.enable()  # --profile-startup / WHIZPER_PROFILE_STARTUP=1: time every import below
+
 import os
-import sys
 import time
 import random
 import re
 import tweepy
 from dotenv import load_dotenv
-from price_fetcher import build_x_daily_summary_text
-from news_monitor import summarize_market_news
+from news_monitor import refresh_news_if_stale, summarize_market_news
+import rate_limit
 
 load_dotenv()
 
@@ -108,9 +110,16 @@ def post(text: str):
     print("Tweeted:", text)
 
 def do_daily():
-    post(build_x_daily_summary_text())
+    # only the daily path needs the market-data stack
+    from price_fetcher import build_x_daily_summary_text
+    with rate_limit.lane(rate_limit.BACKGROUND):
+        text = build_x_daily_summary_text()
+    post(text)
 
 def do_news():
+    # cron entry point: crawl only if no ingester has refreshed the shared store lately
+    with rate_limit.lane(rate_limit.BACKGROUND):
+        refresh_news_if_stale()
     post(_build_news_tweet())
 
 # LISTENER
@@ -171,9 +180,11 @@ def do_listen():
         else:
             backoff = 1
 
-if __name__ == "__main__":
-    if len(sys.argv) > 1:
-        cmd = sys.argv[1].lower()
+def main():
+    startup_profile.report("x_bot")
+    args = startup_profile.args()
+    if args:
+        cmd = args[0].lower()
         if cmd == "daily":
             do_daily()
         elif cmd == "news":
@@ -183,4 +194,7 @@ if __name__ == "__main__":
         else:
             print("usage: python x_bot.py [daily|news|listen]")
     else:
-        print("usage: python x_bot.py [daily|news|listen]")
\ No newline at end of file
+        print("usage: python x_bot.py [daily|news|listen]")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file